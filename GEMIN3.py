@@ -10,6 +10,16 @@ import re
 import hashlib
 import csv
 import threading
+import tempfile
+from collections import deque
+from itertools import islice
+from typing import Iterable, List
+
+# 可选依赖：orjson 序列化速度远高于标准库 json，未安装时自动回退
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # ========================================
 # PySide6 导入
@@ -22,7 +32,8 @@ from PySide6.QtWidgets import (
     QMenuBar, QMenu, QTextEdit, QFrame
 )
 from PySide6.QtCore import (
-    QObject, QThread, Signal, Slot, Qt, QSize, QTimer
+    QObject, QThread, Signal, Slot, Qt, QSize, QTimer,
+    QRunnable, QThreadPool, QMutex
 )
 from PySide6.QtGui import (
     QColor, QPalette, QFont, QIcon, QAction
@@ -40,6 +51,14 @@ COPYRIGHT = f"© 2024-{datetime.datetime.now().year} Adayo Mega Tool. All rights
 
 # 持久化数据文件
 DATA_FILE = "app_data.json"
+HISTORY_FILE = "history.jsonl"              # 历史记录：每行一条 JSON，仅追加
+HISTORY_COMPACT_SIZE = 5 * 1024 * 1024      # 启动时超过该大小则压缩
+HISTORY_CAP = 1000                          # 内存中及压缩后保留的最近记录条数
+HISTORY_DISPLAY_COUNT = 50                  # 历史列表显示的条数
+WRITE_BUFFER_SIZE = 1 << 20                 # 数据文件写缓冲 (1 MB)
+
+# 日志输出窗口最多保留的行数
+LOG_MAX_BLOCKS = 2000
 
 # Log Puller 配置
 LOG_TYPES = [
@@ -73,6 +92,75 @@ class ConfigValidator:
             return False, "ICC_PNO长度不能少于5位，且只能包含字母和数字"
         return True, "ICC_PNO格式正确"
 
+
+# 多个保存任务可能同时在线程池中运行，写盘需串行化
+_save_mutex = QMutex()
+
+def atomic_write_bytes(path: str, payload: bytes) -> None:
+    """先写同目录临时文件再 os.replace，写入中途崩溃时旧文件保持完整"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+def write_app_data_file(data: dict, path: str = DATA_FILE):
+    """将数据原子写入目标文件 (线程安全)"""
+    # 先整体序列化再一次性写入；json.dump 会按 token 逐段写流，明显更慢
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        payload = json.dumps(data, ensure_ascii=False, indent=4).encode('utf-8')
+    _save_mutex.lock()
+    try:
+        atomic_write_bytes(path, payload)
+    finally:
+        _save_mutex.unlock()
+
+
+def append_history_record(record: dict, path: str = HISTORY_FILE):
+    """向历史记录文件追加一条记录 (O(1) 写入)"""
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+def rewrite_history_file(records: list, path: str = HISTORY_FILE):
+    """用给定记录原子重写历史文件 (用于压缩/迁移)"""
+    payload = ''.join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+    atomic_write_bytes(path, payload.encode('utf-8'))
+
+def _intern_keys(pairs: list) -> dict:
+    """JSONL 每行单独解析，键名无法跨行复用；驻留后所有记录共享同一键对象"""
+    return {sys.intern(k): v for k, v in pairs}
+
+def parse_history_lines(lines: Iterable[str]) -> List[dict]:
+    """解析 JSONL 历史记录；追加写入中途崩溃可能留下残缺行，直接跳过"""
+    records = []
+    for line in lines:
+        try:
+            records.append(json.loads(line, object_pairs_hook=_intern_keys))
+        except ValueError:
+            continue
+    return records
+
+
+class SaveWorkerSignals(QObject):
+    """QRunnable 不是 QObject，信号由此类承载"""
+    error = Signal(str)
+
+
+class SaveWorker(QRunnable):
+    """在线程池中执行 JSON 序列化与写盘，避免阻塞 UI 线程"""
+    def __init__(self, data: dict, path: str = DATA_FILE):
+        super().__init__()
+        self.data = data
+        self.path = path
+        self.signals = SaveWorkerSignals()
+
+    def run(self):
+        try:
+            write_app_data_file(self.data, self.path)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+
 # ========================================
 # 3. 核心逻辑 (CoreToolLogic)
 # ========================================
@@ -286,24 +374,30 @@ class CoreToolLogic(QObject):
 
         self.log_signal.emit("配置", "正在生成并推送新的配置文件...", "WARNING")
 
-        temp_config_path = Path("temp_DeviceInfo.txt")
-        new_config_data = self.current_config.copy()
-
-        new_config_data['ICC_PNO'] = new_pno
-        new_config_data['VIN'] = new_vin
+        # 排除 FileHash 字段（不推送到设备），并覆盖 PNO/VIN
+        new_config_data = {k: v for k, v in self.current_config.items() if k != 'FileHash'} | {
+            'ICC_PNO': new_pno,
+            'VIN': new_vin,
+        }
 
+        temp_config_path = None
         try:
-            with open(temp_config_path, 'w', encoding='utf-8') as f:
-                for key, value in new_config_data.items():
-                    if key != 'FileHash':
-                        f.write(f"{key}={value}\n")
+            # 写入系统临时目录，避免在工作目录残留 temp 文件
+            with tempfile.NamedTemporaryFile('w', suffix='.txt', encoding='utf-8', delete=False) as f:
+                temp_config_path = Path(f.name)
+                f.write(''.join(f"{key}={value}\n" for key, value in new_config_data.items()))
         except Exception as e:
+            # 文件已创建但写入失败时同样需要清理
+            if temp_config_path is not None:
+                temp_config_path.unlink(missing_ok=True)
             self.error_signal.emit(f"生成本地临时配置失败: {e}")
             return
 
-        success, output, error = self.run_adb_command(["push", str(temp_config_path), DEVICE_CONFIG_PATH], timeout=30)
-
-        temp_config_path.unlink()
+        try:
+            success, output, error = self.run_adb_command(["push", str(temp_config_path), DEVICE_CONFIG_PATH], timeout=30)
+        finally:
+            # 无论推送是否成功都清理临时文件
+            temp_config_path.unlink(missing_ok=True)
 
         if success:
             self.log_signal.emit("配置", "新配置文件推送成功。", "SUCCESS")
@@ -461,11 +555,16 @@ class CoreToolLogic(QObject):
 class AdayoMegaTool(QMainWindow):
     # 定义连接到 CoreToolLogic 的信号
     check_device_signal = Signal()
+    monitor_device_signal = Signal()
     start_pull_signal = Signal(list, str)
     clear_logcat_signal = Signal()
     reboot_signal = Signal()
     push_config_signal = Signal(str, str)
 
+    # 日志输出格式 (类级常量，避免每条日志重复构建)
+    _LOG_COLOR_MAP = {"INFO": "black", "WARNING": "#ffc107", "ERROR": "#dc3545", "SUCCESS": "#28a745"}
+    _LOG_HTML_TEMPLATE = '<span style="color: gray;">{}</span> <span style="font-weight: bold; color: {};">[{}]</span> {}'
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle(TOOL_NAME)
@@ -476,12 +575,21 @@ class AdayoMegaTool(QMainWindow):
         # 1. 初始化统计变量和历史记录列表
         self.stats_ota_count_value = 0
         self.stats_log_count_value = 0
-        self.history_records = [] # 新增：用于存储持久化的历史记录
+        # 持久化的历史记录，超出上限自动丢弃最旧记录；启动时只保存原始行，首次访问时才解析
+        self._history_raw = deque(maxlen=HISTORY_CAP)
+        self._history_cache = None
         self.log_count = -1
         self.current_pno = "N/A"
         self.current_vin = "N/A"
         self.current_hash = "N/A"
 
+        # 日志输出缓冲：突发日志在 50ms 内合并为一次 QTextEdit 插入
+        self._log_buffer: list[str] = []
+        self._log_flush_timer = QTimer(self)
+        self._log_flush_timer.setSingleShot(True)
+        self._log_flush_timer.setInterval(50)
+        self._log_flush_timer.timeout.connect(self._flush_log)
+
         # 2. 关键修复点：程序启动时加载本地数据
         self._load_app_data()
 
@@ -503,16 +611,20 @@ class AdayoMegaTool(QMainWindow):
 
         # 6. 设置拉伸因子和定时器
         self.main_layout.setStretch(1, 1)
+        # 单个 1 秒定时器：刷新时钟，并每 5 次触发一次设备轮询
+        self._tick = 0
+        self._last_time_str = ""
         self.timer = QTimer(self)
         self.timer.timeout.connect(self._update_time_and_status)
         self.timer.start(1000)
 
-        self.device_monitor_timer = QTimer(self)
-        self.device_monitor_timer.timeout.connect(self.logic.monitor_device_status)
-        self.device_monitor_timer.start(5000)
-
         QTimer.singleShot(100, self.check_device_signal.emit)
 
+        # 数据保存防抖：短时间内的多次成功操作合并为一次写盘
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.timeout.connect(self._flush_save)
+
         # 7. 更新 UI 以反映加载的数据
         self._update_stats_ui()
         self._update_history_ui()
@@ -523,29 +635,88 @@ class AdayoMegaTool(QMainWindow):
     def _load_app_data(self):
         """从本地文件加载统计数据和历史记录"""
         data_path = Path(DATA_FILE)
+        legacy_history = []
         if data_path.exists():
             try:
-                with open(data_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.stats_ota_count_value = data.get('ota_count', 0)
-                    self.stats_log_count_value = data.get('log_count', 0)
-                    self.history_records = data.get('history', [])
+                raw = data_path.read_bytes()
+                data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+                self.stats_ota_count_value = data.get('ota_count', 0)
+                self.stats_log_count_value = data.get('log_count', 0)
+                # 兼容旧版本：历史记录曾与统计数据保存在同一文件中
+                legacy_history = data.get('history', [])
                 self.on_log_message("系统", "成功加载历史统计数据。", "INFO")
             except Exception as e:
                 self.on_log_message("系统", f"加载本地数据失败: {e}", "ERROR")
 
-    def _save_app_data(self):
-        """将统计数据和历史记录保存到本地文件"""
-        data = {
+        try:
+            self._load_history(legacy_history)
+        except Exception as e:
+            self.on_log_message("系统", f"加载历史记录失败: {e}", "ERROR")
+
+    def _load_history(self, legacy_history: list):
+        """读取 JSONL 历史记录的原始行 (延迟解析)，必要时迁移旧数据或压缩文件"""
+        history_path = Path(HISTORY_FILE)
+        if not history_path.exists():
+            self._history_cache = deque(legacy_history, maxlen=HISTORY_CAP)
+            if legacy_history:
+                self._save_history()
+            return
+
+        with open(history_path, 'r', encoding='utf-8') as f:
+            self._history_raw = deque((line for line in f if line.strip()), maxlen=HISTORY_CAP)
+
+        if history_path.stat().st_size > HISTORY_COMPACT_SIZE:
+            self._save_history()
+
+    @property
+    def history_records(self) -> deque:
+        """历史记录，首次访问时才解析 JSONL 原始行并缓存"""
+        if self._history_cache is None:
+            self._history_cache = deque(parse_history_lines(self._history_raw), maxlen=HISTORY_CAP)
+            self._history_raw.clear()
+        return self._history_cache
+
+    def _collect_stats(self) -> dict:
+        """在 UI 线程中生成统计数据的快照"""
+        return {
             'ota_count': self.stats_ota_count_value,
             'log_count': self.stats_log_count_value,
-            'history': self.history_records
         }
+
+    def _save_stats(self):
+        """将统计数据交给后台线程保存到本地文件 (体积很小，每次整体重写)"""
+        worker = SaveWorker(self._collect_stats())
+        worker.signals.error.connect(self._on_save_error)
+        QThreadPool.globalInstance().start(worker)
+
+    def _append_history(self, record: dict):
+        """将单条历史记录追加到 JSONL 文件"""
         try:
-            with open(DATA_FILE, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
+            append_history_record(record)
         except Exception as e:
-            self.on_log_message("系统", f"保存本地数据失败: {e}", "ERROR")
+            self.on_log_message("系统", f"保存历史记录失败: {e}", "ERROR")
+
+    def _save_history(self):
+        """用内存中的记录整体重写历史文件 (仅用于迁移和压缩)"""
+        rewrite_history_file(self.history_records)
+
+    def _save_app_data(self):
+        """同步保存统计数据，仅在退出时调用；历史记录已在每次操作时追加落盘"""
+        self._save_timer.stop()
+        QThreadPool.globalInstance().waitForDone()
+        write_app_data_file(self._collect_stats())
+
+    @Slot(str)
+    def _on_save_error(self, message: str):
+        self.on_log_message("系统", f"保存本地数据失败: {message}", "ERROR")
+
+    def _schedule_save(self):
+        """延迟 1 秒保存，窗口期内的重复请求只会触发一次写盘"""
+        self._save_timer.start(1000)
+
+    @Slot()
+    def _flush_save(self):
+        self._save_stats()
 
     # --- UI 辅助更新方法 ---
 
@@ -558,14 +729,39 @@ class AdayoMegaTool(QMainWindow):
     def _update_history_ui(self):
         """更新历史记录列表"""
         if hasattr(self, 'history_list'):
-            self.history_list.clear()
-            if not self.history_records:
-                self.history_list.addItem("暂无历史操作记录...")
-                return
+            # 批量更新期间关闭重绘和信号，只触发一次布局
+            self.history_list.setUpdatesEnabled(False)
+            self.history_list.blockSignals(True)
+            try:
+                self.history_list.clear()
+                if not self.history_records:
+                    self.history_list.addItem("暂无历史操作记录...")
+                    return
+
+                # 显示最新的记录 (只显示最近50条)
+                self.history_list.addItems([
+                    self._format_history_record(record)
+                    for record in islice(reversed(self.history_records), HISTORY_DISPLAY_COUNT)
+                ])
+            finally:
+                self.history_list.blockSignals(False)
+                self.history_list.setUpdatesEnabled(True)
+
+    def _prepend_history_item(self, record: dict):
+        """在列表顶部插入一条新记录，并移除超出显示上限的尾部记录"""
+        if not hasattr(self, 'history_list'):
+            return
+        if len(self.history_records) == 1:
+            # 列表中只有占位提示，直接整体重建
+            self._update_history_ui()
+            return
+        self.history_list.insertItem(0, self._format_history_record(record))
+        if self.history_list.count() > HISTORY_DISPLAY_COUNT:
+            self.history_list.takeItem(HISTORY_DISPLAY_COUNT)
 
-            # 显示最新的记录
-            for record in reversed(self.history_records[-50:]): # 只显示最近50条
-                self.history_list.addItem(f"[{record['time']}] [{record['type']}] {record['detail']}")
+    @staticmethod
+    def _format_history_record(record: dict) -> str:
+        return f"[{record['time']}] [{record['type']}] {record['detail']}"
 
 
     # --- UI 结构方法 (省略，与前版本一致) ---
@@ -624,13 +820,37 @@ class AdayoMegaTool(QMainWindow):
     def _setup_tab_content(self, main_layout: QVBoxLayout):
         self.tab_widget = QTabWidget()
         self.tab_widget.addTab(self._create_home_panel(), "🏠 主页 (平台概览)")
-        self.tab_widget.addTab(self._create_ota_config_tab(), "🔧 配置更新")
-        self.tab_widget.addTab(self._create_log_puller_tab(), "📑 日志拉取")
-        self.tab_widget.addTab(self._create_toolbox_tab(), "🛠️ 调试工具箱")
-        self.tab_widget.addTab(self._create_history_data_tab(), "⚡ 操作与数据")
+
+        # 其余标签页先放置占位控件，首次切换到该页时才真正创建
+        self._tab_factories = {
+            self.tab_widget.addTab(QWidget(), "🔧 配置更新"): self._create_ota_config_tab,
+            self.tab_widget.addTab(QWidget(), "📑 日志拉取"): self._create_log_puller_tab,
+            self.tab_widget.addTab(QWidget(), "🛠️ 调试工具箱"): self._create_toolbox_tab,
+            self.tab_widget.addTab(QWidget(), "⚡ 操作与数据"): self._create_history_data_tab,
+        }
         self.tab_widget.addTab(QWidget(), "🚀 功能扩展 (Monkey/...)")
+        self.tab_widget.currentChanged.connect(self._lazy_materialize)
         main_layout.addWidget(self.tab_widget)
 
+    @Slot(int)
+    def _lazy_materialize(self, index: int):
+        """用真实内容替换占位标签页"""
+        factory = self._tab_factories.pop(index, None)
+        if factory is None:
+            return
+
+        label = self.tab_widget.tabText(index)
+        placeholder = self.tab_widget.widget(index)
+        # 替换期间屏蔽 currentChanged，避免 remove/insert 引起重入
+        self.tab_widget.blockSignals(True)
+        try:
+            self.tab_widget.removeTab(index)
+            self.tab_widget.insertTab(index, factory(), label)
+            self.tab_widget.setCurrentIndex(index)
+        finally:
+            self.tab_widget.blockSignals(False)
+        placeholder.deleteLater()
+
     def _setup_log_viewer(self, main_layout: QVBoxLayout):
         log_box = QGroupBox("操作日志输出")
         log_box.setFont(QFont("Microsoft YaHei UI", 10, QFont.Bold))
@@ -639,6 +859,9 @@ class AdayoMegaTool(QMainWindow):
         self.log_text_edit = QTextEdit()
         self.log_text_edit.setReadOnly(True)
         self.log_text_edit.setMaximumHeight(150)
+        # 限制日志行数，超出后 Qt 自动丢弃最早的行，避免长时间运行后内存和排版开销持续增长
+        self.log_text_edit.document().setMaximumBlockCount(LOG_MAX_BLOCKS)
+        self._log_scrollbar = self.log_text_edit.verticalScrollBar()
 
         log_layout.addWidget(self.log_text_edit)
         main_layout.addWidget(log_box)
@@ -744,14 +967,21 @@ class AdayoMegaTool(QMainWindow):
         current_config_group = QGroupBox("⚙️ 当前设备配置")
         config_layout = QGridLayout(current_config_group)
 
+        # 配置页使用独立标签，主页卡片的标签留在原布局中
         config_layout.addWidget(QLabel("ICC_PNO:"), 0, 0)
-        config_layout.addWidget(self.current_pno_label, 0, 1)
+        self.ota_pno_label = QLabel(self.current_pno)
+        self.ota_pno_label.setFont(QFont("Consolas", 14, QFont.Bold))
+        config_layout.addWidget(self.ota_pno_label, 0, 1)
 
         config_layout.addWidget(QLabel("VIN:"), 1, 0)
-        config_layout.addWidget(self.current_vin_label, 1, 1)
+        self.ota_vin_label = QLabel(self.current_vin)
+        self.ota_vin_label.setFont(QFont("Consolas", 14, QFont.Bold))
+        config_layout.addWidget(self.ota_vin_label, 1, 1)
 
         config_layout.addWidget(QLabel("文件哈希 (8位):"), 2, 0)
-        config_layout.addWidget(self.current_hash_label, 2, 1)
+        self.ota_hash_label = QLabel(self.current_hash)
+        self.ota_hash_label.setFont(QFont("Consolas", 10))
+        config_layout.addWidget(self.ota_hash_label, 2, 1)
 
         main_layout.addWidget(current_config_group)
 
@@ -810,11 +1040,13 @@ class AdayoMegaTool(QMainWindow):
         log_type_layout = QVBoxLayout(log_type_group)
         self.log_list_widget = QListWidget()
         self.log_list_widget.setSelectionMode(QListWidget.SelectionMode.ExtendedSelection)
+        self._log_items: list[QListWidgetItem] = []  # 保存引用，拉取时无需逐项回查控件
         for log_type in ALL_LOG_TYPES:
             item = QListWidgetItem(log_type)
             item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable | Qt.ItemFlag.ItemIsSelectable)
             item.setCheckState(Qt.CheckState.Checked)
             self.log_list_widget.addItem(item)
+            self._log_items.append(item)
         log_type_layout.addWidget(self.log_list_widget)
         config_layout.addWidget(log_type_group)
 
@@ -847,7 +1079,9 @@ class AdayoMegaTool(QMainWindow):
 
         self.clear_btn = QPushButton("🧹 清理远程 Logcat 日志")
         self.clear_btn.setStyleSheet("background-color: #dc3545; color: white; padding: 10px;")
-        self.clear_btn.setEnabled(False)
+        # 标签页延迟创建，需按当前设备与 Logcat 状态初始化按钮
+        self.start_pull_btn.setEnabled(self.logic.serial is not None)
+        self.clear_btn.setEnabled(self.logic.serial is not None and self.log_count > 0)
         self.clear_btn.clicked.connect(self._clear_remote_logcat)
 
         action_bar.addWidget(self.start_pull_btn)
@@ -906,7 +1140,8 @@ class AdayoMegaTool(QMainWindow):
         history_group = QGroupBox("⚡ 操作历史")
         history_layout = QVBoxLayout(history_group)
         self.history_list = QListWidget()
-        # 历史记录在 __init__ 中被 _update_history_ui 填充
+        # 标签页延迟创建，历史记录在此时才填充 (也是首次解析历史数据的时机)
+        self._update_history_ui()
         history_layout.addWidget(self.history_list)
         main_layout.addWidget(history_group)
 
@@ -948,22 +1183,23 @@ class AdayoMegaTool(QMainWindow):
         self.logic = CoreToolLogic()
         self.logic.moveToThread(self.thread)
 
-        # 1. 逻辑线程信号连接到 UI 槽
-        self.logic.device_connected_signal.connect(self.on_device_connected)
-        self.logic.device_disconnected_signal.connect(self.on_device_disconnected)
-        self.logic.device_status_signal.connect(self.on_status_update)
-        self.logic.error_signal.connect(self.on_error)
-        self.logic.remote_logcat_count_signal.connect(self.on_logcat_count_update)
-        self.logic.task_start_signal.connect(self.on_task_start)
-        self.logic.task_progress_signal.connect(self.on_task_progress)
-        self.logic.task_complete_signal.connect(self.on_task_complete)
-        self.logic.log_signal.connect(self.on_log_message)
-        self.logic.config_pulled_signal.connect(self.on_config_pulled)
+        # 1. 逻辑线程信号连接到 UI 槽 (显式 QueuedConnection，跨线程投递，省去 Auto 连接的运行时线程判断)
+        self.logic.device_connected_signal.connect(self.on_device_connected, Qt.ConnectionType.QueuedConnection)
+        self.logic.device_disconnected_signal.connect(self.on_device_disconnected, Qt.ConnectionType.QueuedConnection)
+        self.logic.device_status_signal.connect(self.on_status_update, Qt.ConnectionType.QueuedConnection)
+        self.logic.error_signal.connect(self.on_error, Qt.ConnectionType.QueuedConnection)
+        self.logic.remote_logcat_count_signal.connect(self.on_logcat_count_update, Qt.ConnectionType.QueuedConnection)
+        self.logic.task_start_signal.connect(self.on_task_start, Qt.ConnectionType.QueuedConnection)
+        self.logic.task_progress_signal.connect(self.on_task_progress, Qt.ConnectionType.QueuedConnection)
+        self.logic.task_complete_signal.connect(self.on_task_complete, Qt.ConnectionType.QueuedConnection)
+        self.logic.log_signal.connect(self.on_log_message, Qt.ConnectionType.QueuedConnection)
+        self.logic.config_pulled_signal.connect(self.on_config_pulled, Qt.ConnectionType.QueuedConnection)
         # 🔔 关键修复点：接收操作成功信号
-        self.logic.operation_success_signal.connect(self.on_operation_success)
+        self.logic.operation_success_signal.connect(self.on_operation_success, Qt.ConnectionType.QueuedConnection)
 
         # 2. UI 信号连接到逻辑线程槽
         self.check_device_signal.connect(self.logic.check_device_and_root, Qt.ConnectionType.QueuedConnection)
+        self.monitor_device_signal.connect(self.logic.monitor_device_status, Qt.ConnectionType.QueuedConnection)
         self.start_pull_signal.connect(self.logic.start_pull_process, Qt.ConnectionType.QueuedConnection)
         self.clear_logcat_signal.connect(self.logic.clear_logcat, Qt.ConnectionType.QueuedConnection)
         self.reboot_signal.connect(self.logic.reboot_device, Qt.ConnectionType.QueuedConnection)
@@ -996,8 +1232,12 @@ class AdayoMegaTool(QMainWindow):
     def on_status_update(self, text: str, color_key: str):
         color_map = {"red": "#dc3545", "green": "#28a745", "yellow": "#ffc107", "blue": "#007bff"}
 
-        self.status_label.setText(text)
-        self.status_indicator.setStyleSheet(f"font-size: 18pt; color: {color_map.get(color_key, 'gray')};")
+        # 监控轮询会反复发送相同状态，内容未变化时跳过重绘
+        if self.status_label.text() != text:
+            self.status_label.setText(text)
+        style = f"font-size: 18pt; color: {color_map.get(color_key, 'gray')};"
+        if self.status_indicator.styleSheet() != style:
+            self.status_indicator.setStyleSheet(style)
 
     @Slot(str)
     def on_error(self, message: str):
@@ -1029,6 +1269,10 @@ class AdayoMegaTool(QMainWindow):
             self.current_pno_label.setText(self.current_pno)
             self.current_vin_label.setText(self.current_vin)
             self.current_hash_label.setText(self.current_hash)
+        if hasattr(self, 'ota_pno_label'):
+            self.ota_pno_label.setText(self.current_pno)
+            self.ota_vin_label.setText(self.current_vin)
+            self.ota_hash_label.setText(self.current_hash)
 
         _, vin_msg = ConfigValidator.validate_vin(self.current_vin)
         self.on_log_message("配置", f"[VIN 验证]: {vin_msg}", "INFO")
@@ -1046,10 +1290,17 @@ class AdayoMegaTool(QMainWindow):
     @Slot(int, str, str, str)
     def on_task_progress(self, index: int, log_type: str, status: str, files_count: str):
         row = index - 1
-        self.task_table.setItem(row, 0, QTableWidgetItem(log_type))
-        self.task_table.setItem(row, 1, QTableWidgetItem(status))
-        self.task_table.setItem(row, 2, QTableWidgetItem(files_count))
-        self.task_table.setItem(row, 3, QTableWidgetItem("N/A"))
+        # 复用已有单元格，只在首次填充时创建 QTableWidgetItem
+        self.task_table.setUpdatesEnabled(False)
+        try:
+            for col, value in enumerate((log_type, status, files_count, "N/A")):
+                item = self.task_table.item(row, col)
+                if item is None:
+                    self.task_table.setItem(row, col, QTableWidgetItem(value))
+                elif item.text() != value:
+                    item.setText(value)
+        finally:
+            self.task_table.setUpdatesEnabled(True)
 
         self.global_progress.setValue(index)
 
@@ -1067,7 +1318,7 @@ class AdayoMegaTool(QMainWindow):
     @Slot(str, str)
     def on_operation_success(self, op_type: str, op_detail: str):
         """接收核心逻辑成功操作信号，更新统计和历史记录，并保存数据"""
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
 
         # 1. 更新统计计数
         if op_type == "OTA配置更新":
@@ -1084,34 +1335,53 @@ class AdayoMegaTool(QMainWindow):
             'detail': op_detail
         }
         self.history_records.append(new_record)
-        self._update_history_ui()
+        self._prepend_history_item(new_record)
 
-        # 3. 保存数据到本地文件 (持久化)
-        self._save_app_data()
+        # 3. 持久化：历史记录直接追加，统计数据防抖后整体重写
+        self._append_history(new_record)
+        self._schedule_save()
 
 
     # --- 通用功能和日志输出 (与前版本一致) ---
 
     @Slot()
     def _update_time_and_status(self):
-        now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        if hasattr(self, 'datetime_label'):
+        now = time.strftime("%Y-%m-%d %H:%M:%S")
+        if now != self._last_time_str and hasattr(self, 'datetime_label'):
+            self._last_time_str = now
             self.datetime_label.setText(f"📅 实时时间: {now}")
 
+        # 每 5 秒在逻辑线程中轮询一次设备状态
+        self._tick = (self._tick + 1) % 5
+        if self._tick == 0:
+            self.monitor_device_signal.emit()
+
     @Slot(str, str, str)
     def on_log_message(self, source: str, message: str, tag: str):
         """将日志信息格式化后输出到 QTextEdit"""
-        timestamp = datetime.datetime.now().strftime("[%H:%M:%S]")
+        timestamp = time.strftime("[%H:%M:%S]")
+        color = self._LOG_COLOR_MAP.get(tag, "black")
+        html_message = self._LOG_HTML_TEMPLATE.format(timestamp, color, source, message)
 
-        color_map = {"INFO": "black", "WARNING": "#ffc107", "ERROR": "#dc3545", "SUCCESS": "#28a745"}
-        color = color_map.get(tag, "black")
+        self._log_buffer.append(html_message)
+        if not self._log_flush_timer.isActive():
+            self._log_flush_timer.start()
 
-        html_message = f'<span style="color: gray;">{timestamp}</span> <span style="font-weight: bold; color: {color};">[{source}]</span> {message}'
+    @Slot()
+    def _flush_log(self):
+        """将缓冲的日志一次性写入 QTextEdit，并只重绘、滚动一次"""
+        if not self._log_buffer:
+            return
 
-        self.log_text_edit.moveCursor(QTextEdit.MoveOperation.End)
-        self.log_text_edit.insertHtml(html_message)
-        self.log_text_edit.insertPlainText("\n")
-        self.log_text_edit.verticalScrollBar().setValue(self.log_text_edit.verticalScrollBar().maximum())
+        # 每条日志单独 append 为一个文本块，保证 setMaximumBlockCount 按行裁剪
+        self.log_text_edit.setUpdatesEnabled(False)
+        try:
+            for html_message in self._log_buffer:
+                self.log_text_edit.append(html_message)
+        finally:
+            self.log_text_edit.setUpdatesEnabled(True)
+        self._log_buffer.clear()
+        self._log_scrollbar.setValue(self._log_scrollbar.maximum())
 
 
     # --- UI 交互操作 (触发信号) (与前版本一致) ---
@@ -1125,11 +1395,7 @@ class AdayoMegaTool(QMainWindow):
             self.on_log_message("配置", f"日志导出路径已设置为: {new_folder}", "INFO")
 
     def _start_pull_process(self):
-        selected_logs = []
-        for i in range(self.log_list_widget.count()):
-            item = self.log_list_widget.item(i)
-            if item.checkState() == Qt.CheckState.Checked:
-                selected_logs.append(item.text())
+        selected_logs = [item.text() for item in self._log_items if item.checkState() == Qt.CheckState.Checked]
 
         if not selected_logs:
             QMessageBox.warning(self, "警告", "请至少选择一种日志类型。")
@@ -1168,8 +1434,12 @@ class AdayoMegaTool(QMainWindow):
         QMessageBox.about(self, "关于", f"{TOOL_NAME} {VERSION}\n作者: {AUTHOR}\nGitHub: {GITHUB_LINK}\n\n集成了 OTA 配置、批量操作、日志拉取、设备监控等多功能一体化测试平台。")
 
     def closeEvent(self, event):
-        """在程序关闭时保存数据"""
-        self._save_app_data()
+        """在程序关闭时保存数据 (同步写盘，保证退出前落盘)"""
+        try:
+            self._save_app_data()
+        except Exception as e:
+            # 窗口即将销毁，缓冲日志来不及刷新，这里同步弹窗提示
+            QMessageBox.warning(self, "保存失败", f"保存本地数据失败: {e}")
         super().closeEvent(event)
 
 
@@ -1,19 +1,24 @@
+import os
+import re
 import sys
 import subprocess
 import datetime
 import shutil
+import shlex
 from pathlib import Path
 import time
+import asyncio
+import threading
 
 # 导入 QTimer
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QGridLayout, QLabel, QLineEdit, QPushButton, QTableWidget,
     QTableWidgetItem, QProgressBar, QFileDialog, QGroupBox,
-    QListWidget, QListWidgetItem, QMessageBox, QHeaderView, QMenuBar, QMenu, QPlainTextEdit, QDialog
+    QListWidget, QMessageBox, QHeaderView, QMenuBar, QMenu, QPlainTextEdit, QDialog
 )
 from PySide6.QtCore import (
-    QObject, QThread, Signal, Slot, Qt, QSize, QTimer
+    QObject, QThread, Signal, Slot, Qt, QSize, QTimer, QEvent
 )
 from PySide6.QtGui import (
     QColor, QPalette, QAction, QFont
@@ -33,11 +38,99 @@ LOG_TYPES = [
     "btsnoop", "tombstones", "dropbox", "resource", "mcu", "aee", "ael", "upgrade"
 ]
 REMOTE_LOG_PATH = "/mnt/sdcard/AdayoLog"
+LOGCAT_REMOTE_PATH = f"{REMOTE_LOG_PATH}/logcat" # 设备端路径，固定使用 '/'，不能经过 Path (Windows 下会变成反斜杠)
 WLAN_LOG_TYPE = "wlan_logs"
 WLAN_LOG_PATH = "/data/vendor/wifi/wlan_logs"
+PULL_CONCURRENCY = 3 # 同时进行的 adb pull 数量 (adbd 单连接复用，过高反而互相抢占)
+REMOTE_COUNT_CACHE_TTL = 2.0 # 远程文件计数结果的缓存时间 (秒)
+ADBD_RESTART_TIMEOUT = 5.0 # adb root 后等待 adbd 重启完成的最长时间 (秒)
+SHELL_SENTINEL = "__ADAYO_DONE__" # 常驻 adb shell 会话中标记命令结束的分隔符
+
+ADB_SERVER_ADDR = ("127.0.0.1", 5037) # adb server 地址，用于 host:track-devices 长连接
+
+# Windows 下启动 adb 时不弹出控制台窗口
+ADB_CREATIONFLAGS = subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
+
+# adb pull 结束时输出的汇总行，例如 "...: 12 files pulled, 0 skipped."
+_PULL_SUMMARY_RE = re.compile(r'(\d+)\s+files? pulled')
+# adb pull 失败特征；\b 避免 "10 files pulled" 被误判为 "0 files pulled"
+_ADB_PULL_FAIL_RE = re.compile(r'pull failed|no such file|\b0 files? pulled', re.IGNORECASE)
 
 ALL_LOG_TYPES = LOG_TYPES + [WLAN_LOG_TYPE]
 
+# 任务状态 -> 表格文字颜色；未列出的状态 (各类失败) 一律为红色
+_STATUS_COLORS = {
+    "拉取中...": "green",
+    "成功": "green",
+    "空目录": "orange",
+}
+
+# 帮助手册内容，标题中的版本号在模块加载时由 VERSION 填充
+MANUAL_TEXT = """
+=========================================================
+Adayo 车载日志拉取工具 GUI 帮助手册 (V{VERSION})
+=========================================================
+
+1. 概述与核心功能
+------------------
+本工具旨在通过图形化界面 (GUI) 高效、安全地拉取车载设备上指定路径的日志文件。
+核心功能包括：
+1.  自动检测设备和 Root 权限尝试。
+2.  **【V2.0.3修复】** 修复了设备断开后，再连接无法自动识别的问题。
+3.  **【V2.0.4修复】** 修复了 Logcat 日志拉取成功后，清理按钮文件计数不更新的问题。
+4.  实时监控设备连接状态，设备断开时状态灯立即变红，并禁用操作。
+5.  支持自定义日志保存路径。
+6.  可视化进度条和任务列表，实时反馈拉取状态。
+7.  一键清理 Logcat 日志，并实时显示文件数量。
+
+2. 前期准备
+------------------
+为确保程序正常运行，请确认以下条件：
+1.  **ADB 环境：** 确保您的电脑已安装 ADB 工具，并将其路径添加到系统环境变量 (PATH) 中。
+2.  **设备连接：** 确保只有一个车载设备通过 USB 连接到电脑，且已开启 USB 调试。
+3.  **ADB 权限：** 首次连接时，请在车载设备上授权 ADB 调试权限。
+
+3. 界面介绍
+------------------
+A. 顶部状态栏 (系统状态)：
+   - 实时显示设备连接状态（🟢绿色：成功，🟡黄色：进行中/警告，🔴红色：断开连接）。
+   - 显示当前连接的设备序列号。
+
+B. 左侧配置区 (任务配置)：
+   - **导出路径：** 默认保存在当前目录下的 'CarLogs' 文件夹。
+   - **日志类型选择：** 默认全选。
+
+C. 主任务区 (任务执行状态)：
+   - **全局任务进度：** 显示总任务的完成百分比。
+   - **实时任务表格：** 详细列出每种日志类型的拉取状态和文件数量。
+
+D. 底部操作栏：
+   - **[启动日志拉取]：** 开始整个拉取流程。
+   - **[清理 Logcat 日志]：** 清空远程 Logcat 目录下的文件。按钮会实时显示当前远程文件数量。
+   - **[打开日志目录]：** 一键打开本地日志保存文件夹。
+
+4. 操作步骤
+------------------
+1.  **连接确认 (自动)：** 启动程序，等待顶部状态栏显示 🟢绿色 '连接成功'，并显示设备序列号。
+2.  **启动拉取 (点击)：** 点击底部 **[启动日志拉取]** 按钮。
+3.  **监控任务：** 观察进度条和任务表格。
+4.  **清理操作 (可选)：** 完成后，**[清理 Logcat 日志]** 按钮上显示的 Logcat 文件数量会更新。点击按钮确认清理。
+5.  **查看结果：** 点击 **[打开日志目录]** 按钮。
+
+5. 故障排除
+------------------
+| 错误现象 | 常见原因 | 解决方案 (优先级) |
+| :--- | :--- | :--- |
+| **状态栏显示红色** | 1. 设备断开；2. ADB未安装；3. 多设备连接。 | 1. 重新插拔 USB 线；2. 检查 ADB 路径；3. 只连接一个设备。 |
+| **拉取失败 (ADB Error)** | 权限不足或目录不存在。 | 确保设备已 Root。 |
+| **清理按钮显示N/A** | 无法访问远程 Logcat 目录。 | 确保 ADB 连接稳定且已 Root。 |
+
+6. 品牌与版本信息
+------------------
+您可以通过菜单栏 **'帮助' -> '关于'** 查看本工具的定制化信息、版本号和作者信息。
+"""
+MANUAL_TEXT_DISPLAY = MANUAL_TEXT.format(VERSION=VERSION)
+
 # ========================================
 # 2. 核心逻辑 (LogPullerLogic)
 # ========================================
@@ -62,56 +155,183 @@ class LogPullerLogic(QObject):
         self.export_path = export_path
         self.selected_logs = selected_logs or []
 
-    # ADB 基础命令执行函数 (保持不变)
-    def run_adb_command(self, command: list, serial: str = None, check_output: bool = False):
+        # ADB 调用全部以协程形式运行在独立的 asyncio 事件循环线程中，
+        # 设备监控、Logcat 计数与日志拉取可以并发等待，互不阻塞
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._run_loop, name="adb-asyncio", daemon=True)
+        self._loop_thread.start()
+        self._device_lock = asyncio.Lock()
+        self._monitor_future = None
+        self._tracker_task = None # host:track-devices 推送任务 (仅在事件循环线程中访问)
+        self._tracking = False
+        self._count_cache = {} # (serial, remote_path) -> (monotonic 时间戳, 文件数)
+        # 常驻 adb shell 会话，计数/清理等短命令复用同一连接
+        self._shell_proc = None
+        self._shell_serial = None
+        self._shell_lock = asyncio.Lock()
+
+        # adb 路径只解析一次，并预先启动 adb server，后续调用不再触发 fork-server 探测
+        self._adb = shutil.which("adb") or "adb"
+        self.submit_coro(self._start_adb_server())
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def submit_coro(self, coro):
+        """将协程提交到 ADB 事件循环线程，返回 concurrent.futures.Future"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    async def _start_adb_server(self):
+        await self._exec_adb(["start-server"], timeout=15)
+
+    async def _exec_adb(self, command: list, serial: str = None, timeout: float = 120):
+        """执行 ADB 命令，返回 (returncode, stdout, stderr)；无法执行时返回 None"""
         serial = serial or self.serial
         if serial:
-            command = ["adb", "-s", serial] + command
+            command = [self._adb, "-s", serial, *command]
         else:
-            command = ["adb"] + command
+            command = [self._adb, *command]
 
         try:
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                check=False,
-                encoding='utf-8',
-                timeout=120
+            # create_subprocess_exec 直接启动 adb，不经过本地 shell
+            proc = await asyncio.create_subprocess_exec(
+                *command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                creationflags=ADB_CREATIONFLAGS
             )
-
-            if check_output:
-                return result.stdout.strip()
-
-            return result.returncode == 0
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                self.error_signal.emit(f"Command timed out: {' '.join(command)}")
+                return None
+
+            return (proc.returncode,
+                    stdout.decode('utf-8', errors='replace').strip(),
+                    stderr.decode('utf-8', errors='replace').strip())
 
         except FileNotFoundError:
             self.error_signal.emit("ADB tool not found. Please ensure ADB is in your system PATH.")
-            return False
-        except subprocess.TimeoutExpired:
-            self.error_signal.emit(f"Command timed out: {' '.join(command)}")
-            return False
+            return None
         except Exception as e:
             self.error_signal.emit(f"ADB execution failed: {e}")
-            return False
+            return None
+
+    async def _ensure_shell(self):
+        """返回与当前设备对应且仍存活的 adb shell 会话，必要时重新建立"""
+        proc = self._shell_proc
+        if proc is not None and proc.returncode is None and self._shell_serial == self.serial:
+            return proc
 
-    def count_remote_files(self, remote_path: str) -> int:
-        """运行 ADB 命令统计远程目录下文件数量"""
-        count_cmd = ["shell", f"find {remote_path} -type f | wc -l"]
-        output = self.run_adb_command(count_cmd, check_output=True)
+        self._close_shell()
+        if not self.serial:
+            return None
         try:
-            return int(output.strip().split()[-1])
-        except Exception:
+            proc = await asyncio.create_subprocess_exec(
+                self._adb, "-s", self.serial, "shell",
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                creationflags=ADB_CREATIONFLAGS
+            )
+        except OSError:
+            return None
+
+        self._shell_proc = proc
+        self._shell_serial = self.serial
+        return proc
+
+    def _close_shell(self):
+        proc, self._shell_proc = self._shell_proc, None
+        self._shell_serial = None
+        if proc is not None and proc.returncode is None:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+
+    async def _shell_run(self, cmd: str, timeout: float = 120):
+        """
+        在常驻 adb shell 会话中执行命令，返回 (退出码, 输出)；会话不可用时返回 None。
+        命令后追加 echo 分隔符与 $?，读到分隔符即视为本条命令结束。
+        """
+        async with self._shell_lock:
+            # adb root 等操作会让 adbd 重启、旧会话失效，失败时用新会话重试一次
+            for _ in range(2):
+                proc = await self._ensure_shell()
+                if proc is None:
+                    return None
+                try:
+                    proc.stdin.write(f"{cmd}\necho \"{SHELL_SENTINEL} $?\"\n".encode('utf-8'))
+                    await proc.stdin.drain()
+
+                    lines = []
+                    while True:
+                        line = await asyncio.wait_for(proc.stdout.readline(), timeout)
+                        if not line:
+                            raise ConnectionResetError("adb shell session closed")
+                        text = line.decode('utf-8', errors='replace').rstrip('\r\n')
+                        # 命令输出末尾没有换行时，分隔符会跟在同一行后面
+                        head, sep, tail = text.partition(SHELL_SENTINEL)
+                        if head:
+                            lines.append(head)
+                        if sep:
+                            return int(tail), "\n".join(lines)
+                except asyncio.TimeoutError:
+                    # 命令本身卡住，重试只会再等一轮，直接放弃
+                    self._close_shell()
+                    return None
+                except (OSError, ValueError):
+                    self._close_shell()
+            return None
+
+    # ADB 基础命令执行函数
+    async def run_adb_command(self, command: list, serial: str = None, check_output: bool = False):
+        result = await self._exec_adb(command, serial)
+        if result is None:
+            return "" if check_output else False
+
+        returncode, stdout, _ = result
+        if check_output:
+            return stdout
+
+        return returncode == 0
+
+    async def count_remote_files(self, remote_path: str, use_cache: bool = True) -> int:
+        """运行 ADB 命令统计远程目录下文件数量 (2 秒内重复调用直接返回缓存结果)"""
+        cache_key = (self.serial, remote_path)
+        if use_cache:
+            cached = self._count_cache.get(cache_key)
+            if cached and time.monotonic() - cached[0] < REMOTE_COUNT_CACHE_TTL:
+                return cached[1]
+
+        # ls -R 只读目录项，不像 find -type f 那样对每个文件 stat；
+        # -p 给目录加 '/'，再排除目录行、"路径:" 分组头和空行，剩下的即为文件
+        count_cmd = f"ls -1RAp {shlex.quote(remote_path)} 2>/dev/null | grep -cv -e '/$' -e ':$' -e '^$'"
+        result = await self._shell_run(count_cmd)
+        # stderr 已在设备端丢弃，输出只应是一个整数；出现其它内容即视为失败
+        try:
+            count = int(result[1])
+        except (TypeError, ValueError):
             return -1 # 返回 -1 表示无法访问或发生错误
 
+        self._count_cache[cache_key] = (time.monotonic(), count)
+        return count
+
+    @Slot()
     def count_remote_logcat(self):
         """【V2.0.4新增】统计远程 Logcat 目录下的文件数量并发出信号。"""
+        self.submit_coro(self._count_remote_logcat())
+
+    async def _count_remote_logcat(self, use_cache: bool = True):
         if not self.serial:
             self.remote_file_count_signal.emit(-1)
-            return
+            return -1
 
-        logcat_path_str = str(Path(REMOTE_LOG_PATH) / "logcat")
-        count = self.count_remote_files(logcat_path_str)
+        count = await self.count_remote_files(LOGCAT_REMOTE_PATH, use_cache)
 
         self.remote_file_count_signal.emit(count)
         return count
@@ -122,21 +342,80 @@ class LogPullerLogic(QObject):
         初始化检查/重新连接：检查设备连接、尝试 Root，并设置监控所需的 self.serial。
         V2.0.3 修复重连逻辑，V2.0.4 修复计数逻辑。
         """
-        self.device_status_signal.emit("正在检查设备连接...", "yellow")
+        self.submit_coro(self._check_device_and_root())
+
+    async def _check_device_and_root(self):
+        async with self._device_lock:
+            await self._connect_device()
 
-        output = self.run_adb_command(["devices"], check_output=True)
+    @staticmethod
+    def _parse_adb_devices(output: str) -> list:
+        """解析 `adb devices` 输出，返回状态为 device 的序列号列表 (排除 unauthorized/offline)"""
         devices = []
-        if output:
-            lines = output.split('\n')
-            for line in lines[1:]:
-                if line.strip() and "device" in line and "unauthorized" not in line:
-                    serial = line.split('\t')[0]
-                    devices.append(serial)
+        for line in output.splitlines():
+            # 标题行 "List of devices attached" 不含制表符，partition 后 sep 为空
+            serial, sep, state = line.partition('\t')
+            if sep and state.strip() == 'device':
+                devices.append(serial)
+        return devices
+
+    @staticmethod
+    def _count_files_fast(path: str) -> int:
+        """基于 os.scandir 的迭代遍历统计文件数，类型判断直接取自目录项，无需逐个 stat"""
+        count = 0
+        stack = [path]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            count += 1
+            except OSError:
+                continue
+        return count
+
+    @staticmethod
+    def _remove_empty_tree(path: str):
+        """删除已确认不含文件的目录：通常一次 os.rmdir 即可，含空子目录时自底向上逐个 rmdir"""
+        try:
+            os.rmdir(path)
+            return
+        except OSError:
+            pass
+        for root, _, _ in os.walk(path, topdown=False):
+            try:
+                os.rmdir(root)
+            except OSError:
+                pass
+
+    async def _wait_for_adbd(self) -> bool:
+        """以指数退避轮询 get-state，直到设备重新处于 device 状态或超过 ADBD_RESTART_TIMEOUT"""
+        deadline = time.monotonic() + ADBD_RESTART_TIMEOUT
+        delay = 0.2
+        while True:
+            # 先等待再查询：adb root 刚返回时旧的 adbd 可能尚未退出
+            await asyncio.sleep(delay)
+            result = await self._exec_adb(["get-state"], timeout=ADBD_RESTART_TIMEOUT)
+            if result is not None and result[1] == "device":
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            delay = min(delay * 2, remaining)
+
+    async def _connect_device(self):
+        self.device_status_signal.emit("正在检查设备连接...", "yellow")
+
+        output = await self.run_adb_command(["devices"], check_output=True)
+        devices = self._parse_adb_devices(output)
 
         if len(devices) != 1:
             # 检查失败，更新状态
             self.device_status_signal.emit("错误: 未找到单个已连接设备。", "red")
             self.serial = None
+            self._close_shell()
             self.remote_file_count_signal.emit(-1) # V2.0.4: 连接失败也发出 -1 信号
             return
 
@@ -146,37 +425,94 @@ class LogPullerLogic(QObject):
 
         # 尝试 Root
         self.device_status_signal.emit(f"设备已连接 ({self.serial})，尝试 Root...", "yellow")
-        self.run_adb_command(["root"])
-        time.sleep(3) # 等待 adbd 重启
+        root_output = await self.run_adb_command(["root"], check_output=True)
+        if "already running as root" not in root_output:
+            await self._wait_for_adbd() # adbd 正在以 root 重启，等待其重新上线
 
         # 再次确认连接
-        output_remount = self.run_adb_command(["remount"], check_output=True)
+        output_remount = await self.run_adb_command(["remount"], check_output=True)
         if "succeeded" in output_remount.lower():
             self.device_status_signal.emit(f"连接成功 ({self.serial})，权限已增强。", "green")
         else:
             self.device_status_signal.emit(f"连接成功 ({self.serial})，Remount 失败。", "yellow")
 
         # 【V2.0.4 修复点】：连接成功后，立即检查 Logcat 数量 (用于清理按钮)
-        self.count_remote_logcat()
+        await self._count_remote_logcat()
 
 
     @Slot()
     def monitor_device_status(self):
         """V2.0.3 修复：周期性检查设备连接状态或尝试重新连接。"""
+        # 上一次轮询尚未结束 (例如正在 Root) 时跳过本次，避免任务堆积
+        if self._monitor_future is not None and not self._monitor_future.done():
+            return
+        self._monitor_future = self.submit_coro(self._monitor_device_status())
+
+    async def _monitor_device_status(self):
+        # track-devices 推送正常工作时无需轮询；推送断开则重建，并在本次回退为 adb devices 轮询
+        if self._tracker_task is None or self._tracker_task.done():
+            self._tracker_task = asyncio.create_task(self._track_devices())
+        elif self._tracking:
+            return
+
+        if self._device_lock.locked():
+            return
+        async with self._device_lock:
+            await self._poll_devices()
+
+    async def _track_devices(self):
+        """通过 adb server 的 host:track-devices 长连接接收设备变化，仅在状态变化时处理"""
+        try:
+            reader, writer = await asyncio.open_connection(*ADB_SERVER_ADDR)
+        except OSError:
+            return
+
+        latest = []
+        changed = asyncio.Event()
+
+        async def _dispatch():
+            # 连接流程 (Root 会让 adbd 重启) 持锁期间的中间状态直接被最新列表覆盖
+            while True:
+                await changed.wait()
+                changed.clear()
+                async with self._device_lock:
+                    await self._handle_device_list(latest)
+
+        dispatcher = None
+        try:
+            request = b"host:track-devices"
+            writer.write(b"%04x%s" % (len(request), request))
+            await writer.drain()
+            if await reader.readexactly(4) != b"OKAY":
+                return
+
+            self._tracking = True
+            dispatcher = asyncio.create_task(_dispatch())
+            while True:
+                length = int(await reader.readexactly(4), 16)
+                payload = await reader.readexactly(length) if length else b""
+                latest = self._parse_adb_devices(payload.decode('utf-8', errors='replace'))
+                changed.set()
+        except (OSError, ValueError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._tracking = False
+            if dispatcher is not None:
+                dispatcher.cancel()
+            writer.close()
+
+    async def _poll_devices(self):
         # 1. 检查当前是否有设备连接
-        output = self.run_adb_command(["devices"], check_output=True)
-        current_devices = []
-        if output:
-            lines = output.split('\n')
-            for line in lines[1:]:
-                if line.strip() and "device" in line and "unauthorized" not in line:
-                    current_devices.append(line.split('\t')[0])
+        output = await self.run_adb_command(["devices"], check_output=True)
+        await self._handle_device_list(self._parse_adb_devices(output))
 
+    async def _handle_device_list(self, current_devices: list):
         # 场景 A: 当前是连接状态 (self.serial 有值)
         if self.serial:
             if self.serial not in current_devices:
                 # 丢失连接 -> 触发断开逻辑
                 self.serial = None
+                self._close_shell()
                 self.device_disconnected_signal.emit()
             else:
                 # 设备仍连接，确保状态正确
@@ -186,7 +522,7 @@ class LogPullerLogic(QObject):
         elif not self.serial:
             if len(current_devices) == 1:
                 # 发现一个新连接的设备，触发完整的连接流程 (会包含 Logcat 计数)
-                self.check_device_and_root()
+                await self._connect_device()
             elif len(current_devices) == 0:
                 # 仍然没有设备连接，保持断开状态
                 self.device_status_signal.emit("错误: 未找到单个已连接设备。", "red")
@@ -198,7 +534,10 @@ class LogPullerLogic(QObject):
 
     @Slot()
     def start_pull_process(self):
-        """开始拉取任务。 (保持不变)"""
+        """开始拉取任务。"""
+        self.submit_coro(self._start_pull_process())
+
+    async def _start_pull_process(self):
         if not self.serial or not self.export_path:
             self.error_signal.emit("设备未连接或导出路径未设置。")
             return
@@ -224,45 +563,34 @@ class LogPullerLogic(QObject):
 
         self.task_start_signal.emit(total_tasks)
 
-        results_summary = []
-        total_files_pulled = 0
-        total_empty_pulled = 0
-        total_fail = 0
-
-        for i, (log_type, remote_path, local_target) in enumerate(tasks):
-            i += 1
+        # 所有拉取一次性提交，由信号量限制同时进行的数量；
+        # 事件循环单线程执行，计数器在两次 await 之间更新，无需额外加锁
+        pull_sem = asyncio.Semaphore(PULL_CONCURRENCY)
+        totals = {'done': 0, 'success': 0, 'empty': 0, 'fail': 0}
 
-            # ** 任务开始前再次检查连接 **
-            if not self.serial:
-                self.error_signal.emit(f"设备在任务 [{log_type}] 开始前断开连接，任务中止。")
-                self.device_disconnected_signal.emit()
-                return
+        async def _pull_one(log_type, remote_path, local_target):
+            async with pull_sem:
+                # ** 任务开始前再次检查连接 **
+                if not self.serial:
+                    return None
 
-            status_text = "拉取中..."
-            self.task_progress_signal.emit(i, log_type, status_text, "N/A")
+                self.task_progress_signal.emit(totals['done'], log_type, "拉取中...", "N/A")
 
-            # WLAN 目录特殊处理，直接拉到导出根目录
-            if log_type == WLAN_LOG_TYPE:
-                pull_cmd = ["pull", remote_path, str(export_path)]
-            else:
-                pull_cmd = ["pull", remote_path, str(local_target)]
-
-            result = subprocess.run(
-                ["adb", "-s", self.serial] + pull_cmd,
-                capture_output=True,
-                text=True,
-                check=False,
-                encoding='utf-8',
-                timeout=300
-            )
+                # WLAN 目录特殊处理，直接拉到导出根目录
+                if log_type == WLAN_LOG_TYPE:
+                    pull_cmd = ["pull", remote_path, str(export_path)]
+                else:
+                    pull_cmd = ["pull", remote_path, str(local_target)]
 
-            output = result.stdout.strip()
-            error = result.stderr.strip()
+                result = await self._exec_adb(pull_cmd, timeout=300)
 
-            is_success = (result.returncode == 0 and
-                          "pull failed" not in error.lower() and
-                          "no such file" not in error.lower() and
-                          "0 files pulled" not in output.lower())
+            output = ""
+            if result is None:
+                is_success = False
+            else:
+                returncode, output, error = result
+                is_success = (returncode == 0 and
+                              not _ADB_PULL_FAIL_RE.search(f"{error}\n{output}"))
 
             file_count = 0
 
@@ -270,67 +598,80 @@ class LogPullerLogic(QObject):
                 final_local_path = export_path / log_type if log_type == WLAN_LOG_TYPE else local_target
 
                 if final_local_path.exists():
-                    # 递归统计拉取到的文件数
-                    file_count = sum(1 for item in final_local_path.rglob('*') if item.is_file())
+                    # 优先使用 adb pull 自身输出的文件数，仅在旧版 adb 无汇总行时才遍历本地目录
+                    match = _PULL_SUMMARY_RE.search(output[-500:])
+                    if match:
+                        file_count = int(match.group(1))
+                    else:
+                        file_count = await asyncio.to_thread(self._count_files_fast, str(final_local_path))
 
                     if file_count > 0:
                         status_text = "成功"
-                        total_files_pulled += 1
+                        totals['success'] += 1
                     else:
                         status_text = "空目录"
-                        total_empty_pulled += 1
+                        totals['empty'] += 1
                         # 自动清理拉取到的空目录
                         if final_local_path.is_dir():
-                            try:
-                                shutil.rmtree(final_local_path)
-                            except OSError:
-                                pass
+                            self._remove_empty_tree(str(final_local_path))
                 else:
                     status_text = "失败 (I/O Error)"
-                    total_fail += 1
+                    totals['fail'] += 1
             else:
                 status_text = "失败 (ADB Error)"
-                total_fail += 1
+                totals['fail'] += 1
 
+            totals['done'] += 1
             file_count_str = f"{file_count} 个文件" if file_count > 0 else ("已清理" if status_text == "空目录" else "N/A")
-            self.task_progress_signal.emit(i, log_type, status_text, file_count_str)
+            self.task_progress_signal.emit(totals['done'], log_type, status_text, file_count_str)
 
-            results_summary.append({
+            return {
                 'log_type': log_type,
                 'status': status_text,
                 'files': file_count,
-            })
+            }
+
+        results = await asyncio.gather(*(_pull_one(*task) for task in tasks))
+
+        if any(r is None for r in results):
+            self.error_signal.emit("设备在拉取任务期间断开连接，任务中止。")
+            self.device_disconnected_signal.emit()
+            return
 
         summary = {
-            'total_files_pulled': total_files_pulled,
-            'total_empty_pulled': total_empty_pulled,
-            'total_fail': total_fail,
-            'results': results_summary
+            'total_files_pulled': totals['success'],
+            'total_empty_pulled': totals['empty'],
+            'total_fail': totals['fail'],
+            'results': results
         }
         self.task_complete_signal.emit(summary, str(export_path))
 
     @Slot()
     def clear_logcat(self):
         """执行 Logcat 远程清理操作。"""
+        self.submit_coro(self._clear_logcat())
+
+    async def _clear_logcat(self):
         if not self.serial:
             self.error_signal.emit("设备未连接或已断开，无法执行清理操作。")
             return
 
-        logcat_path_str = str(Path(REMOTE_LOG_PATH) / "logcat")
-
-        files_before = self.count_remote_files(logcat_path_str)
+        files_before = await self.count_remote_files(LOGCAT_REMOTE_PATH)
         if files_before < 0:
-            self.error_signal.emit(f"清理 Logcat 失败: 无法访问目录 {logcat_path_str}。")
+            self.error_signal.emit(f"清理 Logcat 失败: 无法访问目录 {LOGCAT_REMOTE_PATH}。")
             return
 
         self.device_status_signal.emit(f"正在执行 Logcat 清理 ({files_before} -> 0)...", "blue")
 
-        clear_cmd = ["shell", f"rm -rf {logcat_path_str}/*"]
-        success = self.run_adb_command(clear_cmd)
+        # 不再依赖 sh 展开 "路径/*" (文件数上千时可能超出参数长度限制)；
+        # find -delete 单进程删除目录下全部内容，保留 logcat 目录本身及其属主/权限
+        clear_cmd = f"find {shlex.quote(LOGCAT_REMOTE_PATH)} -mindepth 1 -delete"
+        result = await self._shell_run(clear_cmd)
+        success = result is not None and result[0] == 0
 
         if success:
             # 【V2.0.4 修复点】：清理后强制重新计数
-            files_after = self.count_remote_logcat()
+            files_after = await self._count_remote_logcat(use_cache=False)
 
             if files_after == 0:
                 self.device_status_signal.emit(f"Logcat 清理成功! ({files_before} -> 0)", "green")
@@ -348,7 +689,7 @@ class LogPullerLogic(QObject):
 # ========================================
 
 class HelpManualWindow(QDialog):
-    """用于显示帮助手册内容的独立窗口。（保持不变）"""
+    """用于显示帮助手册内容的独立窗口。"""
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Adayo 日志拉取工具 - 帮助手册")
@@ -358,9 +699,7 @@ class HelpManualWindow(QDialog):
 
         self.text_editor = QPlainTextEdit()
         self.text_editor.setReadOnly(True)
-        # 更新版本号信息到手册
-        manual_text_v204 = MANUAL_TEXT.replace("V2.0.3", "V2.0.4")
-        self.text_editor.setPlainText(manual_text_v204)
+        self.text_editor.setPlainText(MANUAL_TEXT_DISPLAY)
 
         font = self.text_editor.font()
         font.setPointSize(10)
@@ -381,6 +720,13 @@ class MainWindow(QMainWindow):
     monitor_device_signal = Signal()
     check_remote_logcat_signal = Signal() # 【V2.0.4新增】：用于任务完成后强制更新 Logcat 计数
 
+    # 任务表格常用颜色只解析一次
+    _GRAY = QColor("gray")
+    _BLUE = QColor("blue")
+    _LIGHT_GRAY = QColor("lightgray")
+    _RED = QColor("red")
+    _STATUS_QCOLORS = {status: QColor(color) for status, color in _STATUS_COLORS.items()}
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle(f"{TOOL_NAME} v{VERSION}")
@@ -391,12 +737,7 @@ class MainWindow(QMainWindow):
         self.selected_log_types = ALL_LOG_TYPES
         self.logcat_file_count = -1
         self.current_tasks_total = 0
-
-        # 添加时间更新定时器
-        self.time_timer = QTimer(self)
-        self.time_timer.setInterval(1000)  # 每秒更新一次
-        self.time_timer.timeout.connect(self.update_time_display)
-        self.time_timer.start()
+        self._help_window = None
 
         self._setup_logic_thread()
         self._setup_menubar()
@@ -406,16 +747,36 @@ class MainWindow(QMainWindow):
         self._start_monitor_timer()
 
     @Slot()
+    def _on_tick(self):
+        """统一的 1 秒定时器：每 3 次触发一次设备监控，其余时间只刷新时钟"""
+        self._tick = (self._tick + 1) % 3
+        if self._tick == 0:
+            self.monitor_device_signal.emit()
+        # 最小化时时钟不可见，跳过刷新 (监控照常进行)
+        if not self.isMinimized():
+            self.update_time_display()
+
     def update_time_display(self):
-        """更新时间显示"""
-        current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.time_label.setText(f"当前时间: {current_time}")
+        """更新时间显示 (直接拼接 localtime 字段，绕开 strftime 的格式解析)"""
+        t = time.localtime()
+        self.time_label.setText(
+            f"当前时间: {t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d} "
+            f"{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}"
+        )
 
-    # --- 启动定时器 (保持不变) ---
+    def changeEvent(self, event):
+        """从最小化恢复时立即刷新时钟，不必等下一次定时器触发"""
+        if event.type() == QEvent.Type.WindowStateChange and not self.isMinimized():
+            self.update_time_display()
+        super().changeEvent(event)
+
+    # --- 启动定时器 ---
     def _start_monitor_timer(self):
+        # 时钟与设备监控共用一个 1 秒定时器，减少空闲时的唤醒次数
+        self._tick = 0
         self.timer = QTimer(self)
-        self.timer.setInterval(3000)  # 3000 毫秒 = 3 秒
-        self.timer.timeout.connect(self.monitor_device_signal.emit)
+        self.timer.setInterval(1000)
+        self.timer.timeout.connect(self._on_tick)
         self.timer.start()
 
     # --- UI/Action/Signal 槽函数 (保持不变) ---
@@ -501,14 +862,16 @@ class MainWindow(QMainWindow):
         log_type_group = QGroupBox("日志类型选择 (共 15 项)")
         log_type_layout = QVBoxLayout(log_type_group)
         self.log_list_widget = QListWidget()
-        self.log_list_widget.setSelectionMode(QListWidget.MultiSelection)
         self.log_list_widget.setSelectionMode(QListWidget.ExtendedSelection)
 
-        for log_type in ALL_LOG_TYPES:
-            item = QListWidgetItem(log_type)
-            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable | Qt.ItemFlag.ItemIsSelectable)
-            item.setCheckState(Qt.CheckState.Checked)
-            self.log_list_widget.addItem(item)
+        # 一次性添加全部条目，再逐项设置勾选属性
+        self.log_list_widget.addItems(ALL_LOG_TYPES)
+        extra_flags = Qt.ItemFlag.ItemIsUserCheckable | Qt.ItemFlag.ItemIsSelectable
+        checked = Qt.CheckState.Checked
+        for i in range(len(ALL_LOG_TYPES)):
+            item = self.log_list_widget.item(i)
+            item.setFlags(item.flags() | extra_flags)
+            item.setCheckState(checked)
 
         config_layout.addWidget(self.log_list_widget)
         parent_layout.addWidget(config_box)
@@ -530,13 +893,24 @@ class MainWindow(QMainWindow):
         self.task_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.task_table.setRowCount(len(ALL_LOG_TYPES))
 
+        # 第 0、3 列 (日志类型、序号) 固定不变；状态与文件数两列的条目保留引用，之后只改文字和颜色
+        self._status_items = []
+        self._count_items = []
         for i, log_type in enumerate(ALL_LOG_TYPES):
+            status_item = QTableWidgetItem("待运行")
+            status_item.setForeground(self._GRAY)
+            count_item = QTableWidgetItem("N/A")
+            index_item = QTableWidgetItem(str(i + 1))
+            index_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+
             self.task_table.setItem(i, 0, QTableWidgetItem(log_type))
-            self.task_table.setItem(i, 1, QTableWidgetItem("待运行"))
-            self.task_table.setItem(i, 2, QTableWidgetItem("N/A"))
-            self.task_table.setItem(i, 3, QTableWidgetItem(str(i + 1)))
-            self.task_table.item(i, 1).setForeground(QColor("gray"))
-            self.task_table.item(i, 3).setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.task_table.setItem(i, 1, status_item)
+            self.task_table.setItem(i, 2, count_item)
+            self.task_table.setItem(i, 3, index_item)
+            self._status_items.append(status_item)
+            self._count_items.append(count_item)
+        # 行顺序固定，日志类型 -> 行号 直接查表，无需逐行读取单元格文本
+        self._row_for_log = {log_type: i for i, log_type in enumerate(ALL_LOG_TYPES)}
 
         task_layout.addWidget(self.task_table)
         parent_layout.addWidget(task_box)
@@ -586,8 +960,10 @@ class MainWindow(QMainWindow):
 
     @Slot()
     def show_help_manual(self):
-        manual_window = HelpManualWindow(self)
-        manual_window.exec()
+        # 手册窗口首次打开时创建，之后复用同一实例
+        if self._help_window is None:
+            self._help_window = HelpManualWindow(self)
+        self._help_window.exec()
 
 
     @Slot()
@@ -617,15 +993,23 @@ class MainWindow(QMainWindow):
                 selected.append(item.text())
         self.logic.selected_logs = selected
 
-        for i in range(self.task_table.rowCount()):
-            log_type = self.task_table.item(i, 0).text()
-            if log_type in selected:
-                self.task_table.item(i, 1).setText("等待中...")
-                self.task_table.item(i, 1).setForeground(QColor("blue"))
-            else:
-                self.task_table.item(i, 1).setText("跳过")
-                self.task_table.item(i, 1).setForeground(QColor("lightgray"))
-                self.task_table.item(i, 2).setText("N/A")
+        # 批量修改表格时暂停重绘与信号，结束后统一刷新一次
+        self.task_table.setUpdatesEnabled(False)
+        self.task_table.blockSignals(True)
+        try:
+            for log_type, i in self._row_for_log.items():
+                status_item = self._status_items[i]
+                if log_type in selected:
+                    status_item.setText("等待中...")
+                    status_item.setForeground(self._BLUE)
+                else:
+                    status_item.setText("跳过")
+                    status_item.setForeground(self._LIGHT_GRAY)
+                    self._count_items[i].setText("N/A")
+        finally:
+            self.task_table.blockSignals(False)
+            self.task_table.setUpdatesEnabled(True)
+            self.task_table.viewport().update()
 
         self.start_pull_signal.emit()
 
@@ -740,21 +1124,14 @@ class MainWindow(QMainWindow):
     def on_task_progress(self, current: int, log_type: str, status: str, file_count: str):
         self.global_progress.setValue(current)
 
-        for i in range(self.task_table.rowCount()):
-            if self.task_table.item(i, 0).text() == log_type:
-                self.task_table.item(i, 1).setText(status)
-                self.task_table.item(i, 2).setText(file_count)
-
-                color = "green"
-                if "失败" in status or "中止" in status:
-                    color = "red"
-                elif "空目录" in status:
-                    color = "orange"
-                elif "成功" in status:
-                    color = "green"
+        i = self._row_for_log.get(log_type)
+        if i is None:
+            return
 
-                self.task_table.item(i, 1).setForeground(QColor(color))
-                break
+        status_item = self._status_items[i]
+        status_item.setText(status)
+        status_item.setForeground(self._STATUS_QCOLORS.get(status, self._RED))
+        self._count_items[i].setText(file_count)
 
     @Slot(dict, str)
     def on_task_complete(self, summary: dict, export_path_str: str): # <--- 变量名改为 export_path_str 更清晰
@@ -793,72 +1170,6 @@ class MainWindow(QMainWindow):
 # ========================================
 
 if __name__ == "__main__":
-
-    # 帮助手册内容（V2.0.4 版本更新）
-    MANUAL_TEXT = """
-=========================================================
-Adayo 车载日志拉取工具 GUI 帮助手册 (V2.0.4)
-=========================================================
-
-1. 概述与核心功能
-------------------
-本工具旨在通过图形化界面 (GUI) 高效、安全地拉取车载设备上指定路径的日志文件。
-核心功能包括：
-1.  自动检测设备和 Root 权限尝试。
-2.  **【V2.0.3修复】** 修复了设备断开后，再连接无法自动识别的问题。
-3.  **【V2.0.4修复】** 修复了 Logcat 日志拉取成功后，清理按钮文件计数不更新的问题。
-4.  实时监控设备连接状态，设备断开时状态灯立即变红，并禁用操作。
-5.  支持自定义日志保存路径。
-6.  可视化进度条和任务列表，实时反馈拉取状态。
-7.  一键清理 Logcat 日志，并实时显示文件数量。
-
-2. 前期准备
-------------------
-为确保程序正常运行，请确认以下条件：
-1.  **ADB 环境：** 确保您的电脑已安装 ADB 工具，并将其路径添加到系统环境变量 (PATH) 中。
-2.  **设备连接：** 确保只有一个车载设备通过 USB 连接到电脑，且已开启 USB 调试。
-3.  **ADB 权限：** 首次连接时，请在车载设备上授权 ADB 调试权限。
-
-3. 界面介绍
-------------------
-A. 顶部状态栏 (系统状态)：
-   - 实时显示设备连接状态（🟢绿色：成功，🟡黄色：进行中/警告，🔴红色：断开连接）。
-   - 显示当前连接的设备序列号。
-
-B. 左侧配置区 (任务配置)：
-   - **导出路径：** 默认保存在当前目录下的 'CarLogs' 文件夹。
-   - **日志类型选择：** 默认全选。
-
-C. 主任务区 (任务执行状态)：
-   - **全局任务进度：** 显示总任务的完成百分比。
-   - **实时任务表格：** 详细列出每种日志类型的拉取状态和文件数量。
-
-D. 底部操作栏：
-   - **[启动日志拉取]：** 开始整个拉取流程。
-   - **[清理 Logcat 日志]：** 清空远程 Logcat 目录下的文件。按钮会实时显示当前远程文件数量。
-   - **[打开日志目录]：** 一键打开本地日志保存文件夹。
-
-4. 操作步骤
-------------------
-1.  **连接确认 (自动)：** 启动程序，等待顶部状态栏显示 🟢绿色 '连接成功'，并显示设备序列号。
-2.  **启动拉取 (点击)：** 点击底部 **[启动日志拉取]** 按钮。
-3.  **监控任务：** 观察进度条和任务表格。
-4.  **清理操作 (可选)：** 完成后，**[清理 Logcat 日志]** 按钮上显示的 Logcat 文件数量会更新。点击按钮确认清理。
-5.  **查看结果：** 点击 **[打开日志目录]** 按钮。
-
-5. 故障排除
-------------------
-| 错误现象 | 常见原因 | 解决方案 (优先级) |
-| :--- | :--- | :--- |
-| **状态栏显示红色** | 1. 设备断开；2. ADB未安装；3. 多设备连接。 | 1. 重新插拔 USB 线；2. 检查 ADB 路径；3. 只连接一个设备。 |
-| **拉取失败 (ADB Error)** | 权限不足或目录不存在。 | 确保设备已 Root。 |
-| **清理按钮显示N/A** | 无法访问远程 Logcat 目录。 | 确保 ADB 连接稳定且已 Root。 |
-
-6. 品牌与版本信息
-------------------
-您可以通过菜单栏 **'帮助' -> '关于'** 查看本工具的定制化信息、版本号和作者信息。
-"""
-
     app = QApplication(sys.argv)
     app.setApplicationName(TOOL_NAME)
 
@@ -4,8 +4,19 @@ import subprocess
 import time
 import re
 import os
-from datetime import datetime
-from PyQt6.QtGui import QColor, QPainter, QCursor, QIcon, QPalette
+import socket
+import hmac
+import hashlib
+import tempfile
+import threading
+from typing import Optional
+
+# 可选依赖:orjson 解析/序列化速度远高于标准库 json,未安装时自动回退
+try:
+    import orjson
+except ImportError:
+    orjson = None
+from PyQt6.QtGui import QColor, QPalette, QRegularExpressionValidator, QTextCursor
 from PyQt6.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -16,29 +27,25 @@ from PyQt6.QtWidgets import (
     QLineEdit,
     QPushButton,
     QTextEdit,
-    QGroupBox,
     QFormLayout,
     QMessageBox,
     QProgressBar,
-    QStyleFactory,
     QDialog,
     QFrame,
     QGraphicsDropShadowEffect,
-    QFileDialog,
     QCheckBox,
-    QSizePolicy,
-    QScrollArea,
-    QSpacerItem,
 )
 from PyQt6.QtCore import (
     Qt,
-    QThread,
+    QObject,
+    QRunnable,
+    QThreadPool,
+    QProcess,
     pyqtSignal,
     QTimer,
-    QPropertyAnimation,
-    QEasingCurve,
-    QSize,
-    QRect,
+    QFileSystemWatcher,
+    QSocketNotifier,
+    QRegularExpression,
 )
 
 
@@ -46,29 +53,81 @@ from PyQt6.QtCore import (
 # 核心逻辑层 (Backend Logic)
 # ==========================================
 
+_ROOT_PWD = os.getenv("ADB_ROOT_PWD", "adayo@N51")
+_IS_WIN = os.name == "nt"
 
-class AdbWorker(QThread):
-    """后台工作线程:处理所有耗时的 ADB 操作,避免界面卡死"""
+# Windows 下启动子进程时隐藏控制台窗口 (Popen 会复制该对象,可在多次调用间共享)
+_STARTUPINFO = None
+if _IS_WIN:
+    _STARTUPINFO = subprocess.STARTUPINFO()
+    _STARTUPINFO.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+
+# 常驻 adb shell 中每条命令结束时输出的标记,携带命令的退出码
+_SHELL_END_RE = re.compile(r"__END_(\d+)__")
+# 单条设备端命令的超时秒数,超时后杀掉会话,避免卡死单线程任务池
+_SHELL_CMD_TIMEOUT = 20
+# `id` 输出中的 root 身份
+_UID0_RE = re.compile(r"\buid=0\b")
+# `adb devices` 中状态为 device 的行 (排除 unauthorized/offline)
+_DEVICE_RE = re.compile(r"^([A-Za-z0-9._:-]+)[ \t]+device\r?$", re.M)
+
+# adb server 地址,用于 host:track-devices 长连接
+ADB_SERVER_ADDR = ("127.0.0.1", 5037)
+
+
+def json_loads(data):
+    """解析 JSON (str 或 bytes),优先使用 orjson"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps_bytes(obj):
+    """序列化为紧凑的 UTF-8 JSON 字节串 (非 ASCII 字符原样保留)"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class AdbWorkerSignals(QObject):
+    """AdbWorker 的信号载体 (QRunnable 不是 QObject,无法直接定义信号)"""
 
     log_signal = pyqtSignal(str)
     progress_signal = pyqtSignal(bool)
     data_loaded_signal = pyqtSignal(dict)
     operation_finished_signal = pyqtSignal(bool, str)
 
-    def __init__(self, task_type, data=None):
+
+class AdbWorker(QRunnable):
+    """后台任务:在线程池中处理所有耗时的 ADB 操作,避免界面卡死"""
+
+    # 最近一次确认设备可用的时间 (monotonic),有效期内的连续任务跳过 get-state 探测
+    _last_ok_ts = 0.0
+    DEVICE_OK_TTL = 2.0
+
+    def __init__(self, task_type, signals, data=None):
         super().__init__()
+        # 信号由界面侧长期持有的 AdbWorkerSignals 提供,每个任务无需重新连接
+        self.log_signal = signals.log_signal
+        self.progress_signal = signals.progress_signal
+        self.data_loaded_signal = signals.data_loaded_signal
+        self.operation_finished_signal = signals.operation_finished_signal
         self.task_type = task_type
         self.data_to_push = data
         self.remote_path = "/mnt/sdcard/DeviceInfo.txt"
         self.local_filename = "DeviceInfo.txt"
-        self.root_pwd = os.getenv("ADB_ROOT_PWD", "adayo@N51")
+        self.root_pwd = _ROOT_PWD
+        self._shell = None
 
     def run(self):
         self.progress_signal.emit(True)
         try:
-            check_code, _, _ = self.run_cmd("adb get-state")
-            if check_code != 0 and self.task_type != "connect":
-                raise Exception("设备已断开连接,请检查数据线!")
+            # connect 任务自身会检查设备,其余任务在刚成功操作过设备时也无需再探测
+            recently_ok = time.monotonic() - AdbWorker._last_ok_ts < self.DEVICE_OK_TTL
+            if self.task_type != "connect" and not recently_ok:
+                check_code, _, _ = self.run_cmd(["adb", "get-state"])
+                if check_code != 0:
+                    raise Exception("设备已断开连接,请检查数据线!")
 
             if self.task_type == "connect":
                 self.do_connect_and_root()
@@ -77,85 +136,185 @@ class AdbWorker(QThread):
             elif self.task_type == "push":
                 self.do_push()
         except Exception as e:
+            AdbWorker._last_ok_ts = 0.0
             self.log_signal.emit(f"[系统错误] {str(e)}")
             self.operation_finished_signal.emit(False, str(e))
         finally:
+            self.close_shell()
             self.progress_signal.emit(False)
 
-    def run_cmd(self, args, shell=True):
-        startupinfo = None
-        if os.name == "nt":
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-
-        process = subprocess.Popen(
-            args,
+    def run_cmd(self, argv, stream=False):
+        """
+        执行主机端 adb 命令 (参数列表形式,不经过本地 shell 解析)。
+        stream=True 时每收到一行输出就立即写入日志,而不是等命令结束。
+        """
+        process = QProcess()
+        process.setProgram(argv[0])
+        process.setArguments(argv[1:])
+        process.start()
+        if not process.waitForStarted():
+            return -1, "", process.errorString()
+
+        # 线程池线程没有事件循环,用 waitForReadyRead 分段读取输出
+        chunks = []
+        pending = ""
+        while process.state() != QProcess.ProcessState.NotRunning:
+            process.waitForReadyRead(100)
+            chunk = bytes(process.readAllStandardOutput()).decode("utf-8", "ignore")
+            if not chunk:
+                continue
+            chunks.append(chunk)
+            if stream:
+                *lines, pending = (pending + chunk).split("\n")
+                for line in lines:
+                    if line.strip():
+                        self.log_signal.emit(line.strip())
+
+        tail = bytes(process.readAllStandardOutput()).decode("utf-8", "ignore")
+        chunks.append(tail)
+        if stream:
+            for line in (pending + tail).split("\n"):
+                if line.strip():
+                    self.log_signal.emit(line.strip())
+
+        stderr = bytes(process.readAllStandardError()).decode("utf-8", "ignore")
+        if process.exitStatus() != QProcess.ExitStatus.NormalExit:
+            return -1, "".join(chunks).strip(), stderr.strip()
+        return process.exitCode(), "".join(chunks).strip(), stderr.strip()
+
+    def open_shell(self):
+        """启动常驻 adb shell 会话,设备端命令复用同一连接"""
+        self._shell = subprocess.Popen(
+            ["adb", "shell"],
+            stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            shell=shell,
+            stderr=subprocess.STDOUT,
             encoding="utf-8",
             errors="ignore",
-            startupinfo=startupinfo,
+            bufsize=1,
+            startupinfo=_STARTUPINFO,
+        )
+
+    def close_shell(self):
+        shell, self._shell = self._shell, None
+        if shell is not None and shell.poll() is None:
+            try:
+                shell.stdin.close()
+            except OSError:
+                pass
+            shell.kill()
+            shell.wait()
+
+    def shell_cmd(self, cmd, retry=True):
+        """在常驻 adb shell 中执行设备端命令,返回 (退出码, 输出)"""
+        if self._shell is None or self._shell.poll() is not None:
+            self.open_shell()
+
+        # 看门狗: 命令超时则杀掉会话,stdout 随即读到 EOF
+        shell = self._shell
+        expired = threading.Event()
+        watchdog = threading.Timer(
+            _SHELL_CMD_TIMEOUT, lambda: (expired.set(), shell.kill())
         )
-        stdout, stderr = process.communicate()
-        return process.returncode, stdout.strip(), stderr.strip()
+        watchdog.start()
+        try:
+            shell.stdin.write(f"{cmd}\necho __END_$?__\n")
+            shell.stdin.flush()
+
+            lines = []
+            for line in shell.stdout:
+                match = _SHELL_END_RE.search(line)
+                if match:
+                    # 命令输出末尾无换行时,标记与输出位于同一行
+                    head = line[: match.start()]
+                    if head:
+                        lines.append(head)
+                    return int(match.group(1)), "".join(lines).strip()
+                lines.append(line)
+        except (OSError, ValueError):
+            pass
+        finally:
+            watchdog.cancel()
+
+        self.close_shell()
+        if expired.is_set():
+            self.log_signal.emit(f"[警告] 设备命令超时 ({_SHELL_CMD_TIMEOUT}s): {cmd}")
+            return -1, ""
+        # 会话已断开 (例如 adb root 重启了 adbd),重建后重试一次
+        if retry:
+            return self.shell_cmd(cmd, retry=False)
+        return -1, ""
 
     def do_connect_and_root(self):
-        code, out, _ = self.run_cmd("adb devices")
-        if len(out.split("\n")) <= 1:
+        code, out, _ = self.run_cmd(["adb", "devices"])
+        device = _DEVICE_RE.search(out)
+        if not device:
             self.log_signal.emit("[错误] 未发现任何 ADB 设备,请检查数据线!")
             self.operation_finished_signal.emit(False, "未连接设备")
             return
 
         self.log_signal.emit(">>> 开始连接设备并获取 Root 权限...")
-        self.log_signal.emit("[1/4] 等待设备连接...")
-        self.run_cmd("adb wait-for-device")
+        self.log_signal.emit(f"[1/4] 等待设备连接 ({device.group(1)})...")
+        self.run_cmd(["adb", "wait-for-device"])
 
         self.log_signal.emit("[2/4] 发送授权密码...")
-        self.run_cmd(f'adb shell "setprop service.adb.root.password {self.root_pwd}"')
-
-        self.log_signal.emit("[3/4] 执行 Root 重启...")
-        self.run_cmd("adb root")
-
-        self.log_signal.emit("等待 adbd 重启 (3秒)...")
-        time.sleep(3)
+        # 授权与身份查询合并为一条设备端命令
+        code, out = self.shell_cmd(
+            f"setprop service.adb.root.password {self.root_pwd} && id"
+        )
 
-        code, out, _ = self.run_cmd("adb shell id")
-        if "uid=0" not in out:
-            raise Exception("获取 Root 权限失败,请检查连接或密码。")
+        if _UID0_RE.search(out):
+            # adbd 已是 root,无需重启
+            self.log_signal.emit("[3/4] adbd 已处于 Root 状态,跳过重启")
+        else:
+            self.log_signal.emit("[3/4] 执行 Root 重启...")
+            self.run_cmd(["adb", "root"])
+
+            self.log_signal.emit("等待 adbd 重启 (最长3秒)...")
+            # 每 100ms 查询一次 id,一旦已是 root 立即继续,不再固定等待 3 秒
+            deadline = time.monotonic() + 3
+            while True:
+                time.sleep(0.1)
+                code, out = self.shell_cmd("id")
+                if code == 0 and _UID0_RE.search(out):
+                    break
+                if time.monotonic() >= deadline:
+                    raise Exception("获取 Root 权限失败,请检查连接或密码。")
 
         self.log_signal.emit("[4/4] 挂载分区 (Remount)...")
-        self.run_cmd("adb remount")
+        self.run_cmd(["adb", "remount"])
 
         self.log_signal.emit(">>> ✅ 设备连接成功且已获取 Root 权限")
+        AdbWorker._last_ok_ts = time.monotonic()
         self.operation_finished_signal.emit(True, "Connected")
 
     def do_pull(self):
         self.log_signal.emit(f">>> 从设备拉取文件: {self.remote_path}")
 
-        code, _, _ = self.run_cmd(f'adb shell "ls {self.remote_path}"')
-        if code != 0:
+        # 直接 cat 文件内容并在内存中解析,省去 ls 探测、adb pull 落盘和重新读取
+        code, content = self.shell_cmd(f"cat {self.remote_path}")
+        if code != 0 or not content:
             raise Exception("设备中未找到目标文件 DeviceInfo.txt")
 
-        code, out, err = self.run_cmd(
-            f'adb pull "{self.remote_path}" "{self.local_filename}"'
-        )
-        if code != 0:
-            raise Exception(f"拉取失败: {err}")
-
         self.log_signal.emit("文件拉取成功,正在解析...")
 
         try:
-            with open(self.local_filename, "r", encoding="utf-8") as f:
-                content = f.read()
-                data = json.loads(content)
-                self.data_loaded_signal.emit(data)
-                self.log_signal.emit(f"解析成功: {content}")
-                self.operation_finished_signal.emit(True, "Pull Success")
-        except json.JSONDecodeError:
+            data = json_loads(content)
+        except json.JSONDecodeError:  # orjson.JSONDecodeError 亦是其子类
             raise Exception("文件内容不是有效的 JSON 格式")
-        except Exception as e:
-            raise Exception(f"读取文件失败: {str(e)}")
+
+        # 本地仍保留一份副本,便于留档
+        try:
+            with open(self.local_filename, "w", encoding="utf-8") as f:
+                f.write(content)
+        except OSError as e:
+            self.log_signal.emit(f"[提示] 本地副本写入失败: {str(e)}")
+
+        self.data_loaded_signal.emit(data)
+        # 只记录摘要,不把整份 JSON 跨线程送进日志控件排版
+        self.log_signal.emit(f"解析成功: {len(content)} 字符, {len(data)} 个字段")
+        AdbWorker._last_ok_ts = time.monotonic()
+        self.operation_finished_signal.emit(True, "Pull Success")
 
     def do_push(self):
         self.log_signal.emit(">>> 准备推送到设备...")
@@ -163,79 +322,175 @@ class AdbWorker(QThread):
         if not self.data_to_push:
             raise Exception("没有数据可推送")
 
-        temp_file = f"{self.local_filename}.tmp"
+        payload = json_dumps_bytes(self.data_to_push)
+        local_digest = hashlib.sha256(payload).hexdigest()
+
+        # 临时文件写到系统临时目录 (Linux 下通常是内存文件系统),推送后无论成败都删除
+        temp_file = None
         try:
-            with open(temp_file, "w", encoding="utf-8") as f:
-                json.dump(
-                    self.data_to_push, f, ensure_ascii=False, separators=(",", ":")
-                )
+            with tempfile.NamedTemporaryFile("wb", suffix=".txt", delete=False) as f:
+                temp_file = f.name
+                f.write(payload)
             self.log_signal.emit("本地临时文件生成成功")
         except Exception as e:
+            # 文件已创建但写入失败时同样需要清理
+            if temp_file is not None:
+                try:
+                    os.unlink(temp_file)
+                except OSError:
+                    pass
             raise Exception(f"本地写入失败: {str(e)}")
 
+        try:
+            self._push_and_verify(temp_file, payload, local_digest)
+        finally:
+            os.unlink(temp_file)
+
+    def _push_and_verify(self, temp_file, payload, local_digest):
         backup_path = f"{self.remote_path}.backup"
-        self.run_cmd(
-            f'adb shell "cp {self.remote_path} {backup_path} 2>/dev/null || true"'
-        )
+        self.shell_cmd(f"cp {self.remote_path} {backup_path} 2>/dev/null || true")
 
-        code, out, err = self.run_cmd(f'adb push "{temp_file}" "{self.remote_path}"')
+        code, out, err = self.run_cmd(["adb", "push", temp_file, self.remote_path], stream=True)
         if code != 0:
             raise Exception(f"Push 失败: {err}")
 
         self.log_signal.emit("正在验证设备端文件完整性...")
-        _, remote_out, _ = self.run_cmd(f'adb shell "cat {self.remote_path}"')
+        # 只回传 64 字节的 SHA-256 摘要与本地比对,无需把整个文件 cat 回来
+        code, remote_out = self.shell_cmd(f"sha256sum {self.remote_path}")
+        if code == 0 and remote_out:
+            verified = remote_out.split()[0].lower() == local_digest
+        else:
+            # 设备端没有 sha256sum 时退回逐字节比对文件内容
+            _, remote_out = self.shell_cmd(f"cat {self.remote_path}")
+            verified = remote_out == payload.decode("utf-8").strip()
 
-        if len(remote_out) > 10 and "VIN" in remote_out:
-            self.run_cmd(f'adb shell "rm {backup_path} 2>/dev/null || true"')
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
+        if verified:
+            self.shell_cmd(f"rm {backup_path} 2>/dev/null || true")
             self.log_signal.emit(">>> ✅ 推送并验证成功!")
+            AdbWorker._last_ok_ts = time.monotonic()
             self.operation_finished_signal.emit(True, "Push Success")
         else:
-            self.run_cmd(f'adb shell "mv {backup_path} {self.remote_path}"')
+            self.shell_cmd(f"mv {backup_path} {self.remote_path}")
             self.log_signal.emit("❌ 验证失败,已自动恢复原文件")
             self.operation_finished_signal.emit(False, "设备端校验不通过,已回滚")
 
 
+USERS_FILE = "users.json"
+
+
+def verify_password(stored: Optional[str], password: str) -> bool:
+    """
+    校验密码 (恒定时间比较)。
+    stored 支持明文,或 "pbkdf2_sha256$迭代次数$盐(hex)$摘要(hex)" 格式的哈希值。
+    """
+    if not isinstance(stored, str):
+        return False
+    if stored.startswith("pbkdf2_sha256$"):
+        try:
+            _, iterations, salt, digest = stored.split("$")
+            computed = hashlib.pbkdf2_hmac(
+                "sha256", password.encode("utf-8"), bytes.fromhex(salt), int(iterations)
+            )
+        except ValueError:
+            return False
+        return hmac.compare_digest(computed.hex(), digest)
+    return hmac.compare_digest(stored.encode("utf-8"), password.encode("utf-8"))
+
+
+# 登录框样式表,模块加载时只构造一次
+_LOGIN_CONTAINER_QSS = """
+    QFrame {
+        background-color: white;
+        border-radius: 15px;
+    }
+"""
+
+_LOGIN_LEFT_QSS = """
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #0078d7, stop:1 #005a9e);
+    border-top-left-radius: 15px;
+    border-bottom-left-radius: 15px;
+"""
+
+_LOGIN_BTN_QSS = """
+    QPushButton {
+        background-color: #0078d7;
+        color: white;
+        border-radius: 5px;
+        font-size: 14px;
+    }
+    QPushButton:hover { background-color: #005a9e; }
+    QPushButton:pressed { background-color: #004578; }
+"""
+
+# 输入框校验失败时通过动态属性切换红框,无需重设整段样式
+_LOGIN_DIALOG_QSS = """
+    QLineEdit[invalid="true"] { border: 1px solid red; }
+"""
+
+
+def _set_style_property(widget, name, value):
+    """切换样式用的动态属性并重新 polish,让样式引擎重新匹配规则"""
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    widget.style().unpolish(widget)
+    widget.style().polish(widget)
+
+
 class LoginDialog(QDialog):
     def __init__(self):
         super().__init__()
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
         self.setFixedSize(450, 300)
+
+        # 账号表只在打开对话框时读取一次,文件变化时才重新加载
+        self._users = {}
+        self._users_error = None
+        self._users_watcher = QFileSystemWatcher(self)
+        self._users_watcher.fileChanged.connect(self.load_users)
+        self.load_users()
+
         self.setup_ui()
 
+    def load_users(self):
+        try:
+            with open(USERS_FILE, "rb") as f:
+                users = json_loads(f.read())
+            if not isinstance(users, dict):
+                raise ValueError("账号表格式应为 {账号: 密码}")
+            self._users = users
+            self._users_error = None
+        except Exception as e:
+            self._users = {}
+            self._users_error = str(e)
+
+        # 编辑器"先删后写"保存文件时监听会失效,需重新添加
+        if os.path.exists(USERS_FILE) and USERS_FILE not in self._users_watcher.files():
+            self._users_watcher.addPath(USERS_FILE)
+
     def setup_ui(self):
+        self.setStyleSheet(_LOGIN_DIALOG_QSS)
+
         self.main_container = QFrame(self)
         self.main_container.setGeometry(10, 10, 430, 280)
-        self.main_container.setStyleSheet(
-            """
-            QFrame {
-                background-color: white;
-                border-radius: 15px;
-            }
-        """
-        )
+        self.main_container.setStyleSheet(_LOGIN_CONTAINER_QSS)
 
-        shadow = QGraphicsDropShadowEffect(self)
-        shadow.setBlurRadius(20)
-        shadow.setXOffset(0)
-        shadow.setYOffset(5)
-        shadow.setColor(QColor(0, 0, 0, 80))
-        self.main_container.setGraphicsEffect(shadow)
+        # 阴影效果挂在对话框上复用,重建界面时不再新建
+        if getattr(self, "_shadow", None) is None:
+            self._shadow = QGraphicsDropShadowEffect(self)
+            self._shadow.setBlurRadius(20)
+            self._shadow.setXOffset(0)
+            self._shadow.setYOffset(5)
+            self._shadow.setColor(QColor(0, 0, 0, 80))
+        self.main_container.setGraphicsEffect(self._shadow)
 
         layout = QHBoxLayout(self.main_container)
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(0)
 
         left_panel = QFrame()
-        left_panel.setStyleSheet(
-            """
-            background: qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #0078d7, stop:1 #005a9e);
-            border-top-left-radius: 15px;
-            border-bottom-left-radius: 15px;
-        """
-        )
+        left_panel.setStyleSheet(_LOGIN_LEFT_QSS)
         left_panel.setFixedWidth(160)
 
         v_left = QVBoxLayout(left_panel)
@@ -288,6 +543,13 @@ class LoginDialog(QDialog):
         # 2. 再绑定逻辑信号 (此时 self.pass_input 已经存在了)
         self.user_input.returnPressed.connect(self.pass_input.setFocus)
         self.pass_input.returnPressed.connect(self.check_login)
+        # 重新输入时清除红框
+        self.user_input.textChanged.connect(
+            lambda: _set_style_property(self.user_input, "invalid", False)
+        )
+        self.pass_input.textChanged.connect(
+            lambda: _set_style_property(self.pass_input, "invalid", False)
+        )
 
         v_right.addWidget(self.user_input)
         v_right.addWidget(self.pass_input)
@@ -295,18 +557,7 @@ class LoginDialog(QDialog):
 
         self.btn_login = QPushButton("立即登录")
         self.btn_login.setMinimumHeight(40)
-        self.btn_login.setStyleSheet(
-            """
-            QPushButton {
-                background-color: #0078d7;
-                color: white;
-                border-radius: 5px;
-                font-size: 14px;
-            }
-            QPushButton:hover { background-color: #005a9e; }
-            QPushButton:pressed { background-color: #004578; }
-        """
-        )
+        self.btn_login.setStyleSheet(_LOGIN_BTN_QSS)
         self.btn_login.clicked.connect(self.check_login)
         self.btn_login.setDefault(True)
         v_right.addWidget(self.btn_login)
@@ -343,22 +594,23 @@ class LoginDialog(QDialog):
         username = self.user_input.text().strip()
         password = self.pass_input.text().strip()
 
-        try:
-            with open("users.json", "r", encoding="utf-8") as f:
-                users = json.load(f)
-
-            if users.get(username) == password:
-                self.accept()
-            else:
-                self.user_input.setStyleSheet("border: 1px solid red;")
-                self.pass_input.setStyleSheet("border: 1px solid red;")
-                QMessageBox.warning(
-                    self,
-                    "验证失败",
-                    "账号或密码错误!\n若忘记账号密码,请查看界面上方的【操作手册】。",
-                )
-        except Exception as e:
-            QMessageBox.critical(self, "系统错误", f"配置文件读取失败: {str(e)}")
+        if self._users_error is not None:
+            # 上次读取失败 (例如文件尚不存在),再尝试一次
+            self.load_users()
+        if self._users_error is not None:
+            QMessageBox.critical(self, "系统错误", f"配置文件读取失败: {self._users_error}")
+            return
+
+        if verify_password(self._users.get(username), password):
+            self.accept()
+        else:
+            _set_style_property(self.user_input, "invalid", True)
+            _set_style_property(self.pass_input, "invalid", True)
+            QMessageBox.warning(
+                self,
+                "验证失败",
+                "账号或密码错误!\n若忘记账号密码,请查看界面上方的【操作手册】。",
+            )
 
 
 # ==========================================
@@ -381,9 +633,7 @@ class ModernCard(QFrame):
 
         if title:
             title_label = QLabel(title)
-            title_label.setStyleSheet(
-                "font-size: 14px; font-weight: bold; color: #333;"
-            )
+            title_label.setObjectName("cardTitle")
             layout.addWidget(title_label)
 
 
@@ -392,7 +642,7 @@ class StatusIndicator(QWidget):
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.status = "disconnected"
+        self.is_connected = False
         self.setFixedHeight(40)
         self.setup_ui()
 
@@ -401,28 +651,71 @@ class StatusIndicator(QWidget):
         layout.setContentsMargins(0, 0, 0, 0)
 
         self.dot = QLabel("●")
-        self.dot.setStyleSheet("font-size: 20px; color: #dc3545;")
+        self.dot.setObjectName("statusDot")
 
         self.text = QLabel("未连接")
-        self.text.setStyleSheet("font-size: 14px; font-weight: 500; color: #666;")
+        self.text.setObjectName("statusText")
 
         layout.addWidget(self.dot)
         layout.addWidget(self.text)
         layout.addStretch()
 
     def set_status(self, connected):
-        if connected:
-            self.status = "connected"
-            self.dot.setStyleSheet("font-size: 20px; color: #28a745;")
-            self.text.setText("已连接 (Root)")
-            self.text.setStyleSheet(
-                "font-size: 14px; font-weight: 500; color: #28a745;"
-            )
-        else:
-            self.status = "disconnected"
-            self.dot.setStyleSheet("font-size: 20px; color: #dc3545;")
-            self.text.setText("未连接")
-            self.text.setStyleSheet("font-size: 14px; font-weight: 500; color: #666;")
+        connected = bool(connected)
+        if connected == self.is_connected:
+            # 状态未变化,不重复设置样式表
+            return
+        self.is_connected = connected
+        # 颜色由全局样式表中的 [connected="true"] 规则决定
+        _set_style_property(self.dot, "connected", connected)
+        _set_style_property(self.text, "connected", connected)
+        self.text.setText("已连接 (Root)" if connected else "未连接")
+
+
+# 按钮类型 -> (常态, 悬停, 按下) 背景色
+_BTN_VARIANTS = {
+    "primary": ("#0078d7", "#005a9e", "#004578"),
+    "success": ("#28a745", "#218838", "#1e7e34"),
+    "danger": ("#dc3545", "#c82333", "#bd2130"),
+    "secondary": ("#6c757d", "#5a6268", "#545b62"),
+}
+
+
+def _btn_variant_style(variant, normal, hover, pressed):
+    selector = f'QPushButton[variant="{variant}"]'
+    return f"""
+    {selector} {{
+        background-color: {normal};
+        color: white;
+    }}
+    {selector}:hover {{
+        background-color: {hover};
+    }}
+    {selector}:pressed {{
+        background-color: {pressed};
+    }}
+"""
+
+
+def _build_btn_qss():
+    selectors = [f'QPushButton[variant="{v}"]' for v in _BTN_VARIANTS]
+    base = f"""
+    {", ".join(selectors)} {{
+        border: none;
+        border-radius: 6px;
+        padding: 10px 20px;
+        font-size: 13px;
+        font-weight: 500;
+        min-height: 36px;
+    }}
+    {", ".join(s + ":disabled" for s in selectors)} {{
+        background-color: #e9ecef;
+        color: #adb5bd;
+    }}
+"""
+    return base + "".join(
+        _btn_variant_style(v, *colors) for v, colors in _BTN_VARIANTS.items()
+    )
 
 
 class ModernButton(QPushButton):
@@ -434,87 +727,8 @@ class ModernButton(QPushButton):
         self.apply_style()
 
     def apply_style(self):
-        base_style = """
-            QPushButton {
-                border: none;
-                border-radius: 6px;
-                padding: 10px 20px;
-                font-size: 13px;
-                font-weight: 500;
-                min-height: 36px;
-            }
-            QPushButton:disabled {
-                background-color: #e9ecef;
-                color: #adb5bd;
-            }
-        """
-
-        if self.style_type == "primary":
-            style = (
-                base_style
-                + """
-                QPushButton {
-                    background-color: #0078d7;
-                    color: white;
-                }
-                QPushButton:hover {
-                    background-color: #005a9e;
-                }
-                QPushButton:pressed {
-                    background-color: #004578;
-                }
-            """
-            )
-        elif self.style_type == "success":
-            style = (
-                base_style
-                + """
-                QPushButton {
-                    background-color: #28a745;
-                    color: white;
-                }
-                QPushButton:hover {
-                    background-color: #218838;
-                }
-                QPushButton:pressed {
-                    background-color: #1e7e34;
-                }
-            """
-            )
-        elif self.style_type == "danger":
-            style = (
-                base_style
-                + """
-                QPushButton {
-                    background-color: #dc3545;
-                    color: white;
-                }
-                QPushButton:hover {
-                    background-color: #c82333;
-                }
-                QPushButton:pressed {
-                    background-color: #bd2130;
-                }
-            """
-            )
-        else:  # secondary
-            style = (
-                base_style
-                + """
-                QPushButton {
-                    background-color: #6c757d;
-                    color: white;
-                }
-                QPushButton:hover {
-                    background-color: #5a6268;
-                }
-                QPushButton:pressed {
-                    background-color: #545b62;
-                }
-            """
-            )
-
-        self.setStyleSheet(style)
+        variant = self.style_type if self.style_type in _BTN_VARIANTS else "secondary"
+        _set_style_property(self, "variant", variant)
 
 
 class ModernInput(QLineEdit):
@@ -522,55 +736,232 @@ class ModernInput(QLineEdit):
 
     def __init__(self, placeholder="", parent=None):
         super().__init__(parent)
+        self.setObjectName("modernInput")
         self.setPlaceholderText(placeholder)
-        self.setStyleSheet(
-            """
-            QLineEdit {
-                border: 2px solid #e9ecef;
-                border-radius: 6px;
-                padding: 10px 12px;
-                font-size: 13px;
-                background-color: white;
-                min-height: 38px;
-            }
-            QLineEdit:focus {
-                border: 2px solid #0078d7;
-                background-color: #f8f9fa;
-            }
-            QLineEdit:disabled {
-                background-color: #e9ecef;
-                color: #6c757d;
-            }
-        """
-        )
 
 
 # ==========================================
 # 主界面 (Modern UI)
 # ==========================================
 
+# 各字段输入时允许的字符 (大小写均可,可带空格,编辑结束时统一转大写并去掉空格)
+_FIELD_INPUT_PATTERNS = {
+    "ICC_PNO": r"[A-Za-z0-9_\- ]*",
+    "VIN": r"(?: *[A-Za-z0-9]){0,17} *",
+    "f1A1": r"[A-Fa-f0-9 ]*",
+    "0525": r"[A-Fa-f0-9 ]*",
+}
+
+# 主界面样式表:各控件通过 objectName 选择器匹配,整张表只解析一次
+_MAIN_QSS = """
+    QLabel#cardTitle {
+        font-size: 14px;
+        font-weight: bold;
+        color: #333;
+    }
+
+    QLabel#statusDot { font-size: 20px; color: #dc3545; }
+    QLabel#statusDot[connected="true"] { color: #28a745; }
+    QLabel#statusText { font-size: 14px; font-weight: 500; color: #666; }
+    QLabel#statusText[connected="true"] { color: #28a745; }
+
+    QLineEdit#modernInput {
+        border: 2px solid #e9ecef;
+        border-radius: 6px;
+        padding: 10px 12px;
+        font-size: 13px;
+        background-color: white;
+        color: #212529;
+        min-height: 38px;
+    }
+    QLineEdit#modernInput:focus {
+        border: 2px solid #0078d7;
+        background-color: #f8f9fa;
+        color: #212529;
+    }
+    QLineEdit#modernInput:disabled {
+        background-color: #e9ecef;
+        color: #6c757d;
+    }
+
+    QFrame#toolbar {
+        background-color: white;
+        border-radius: 8px;
+        padding: 10px;
+    }
+    QLabel#logoLabel {
+        font-size: 18px;
+        font-weight: bold;
+        color: #0078d7;
+        padding: 5px 10px;
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #e3f2fd, stop:1 transparent);
+        border-radius: 5px;
+    }
+    QCheckBox#themeToggle {
+        font-size: 12px;
+        color: #666;
+        spacing: 5px;
+    }
+    QCheckBox#themeToggle::indicator {
+        width: 40px;
+        height: 20px;
+        border-radius: 10px;
+    }
+    QCheckBox#themeToggle::indicator:unchecked {
+        background-color: #ccc;
+    }
+    QCheckBox#themeToggle::indicator:checked {
+        background-color: #0078d7;
+    }
+
+    QLabel#deviceInfo {
+        font-size: 13px;
+        color: #666;
+        line-height: 1.6;
+        padding: 20px;
+        background-color: #f8f9fa;
+        border-radius: 6px;
+    }
+    QLabel#fieldLabel { font-size: 13px; font-weight: 500; color: #495057; }
+
+    QFrame#logPanel {
+        background-color: white;
+        border-radius: 8px;
+    }
+    QFrame#logHeader {
+        background-color: #f8f9fa;
+        border-top-left-radius: 8px;
+        border-top-right-radius: 8px;
+        padding: 10px 15px;
+    }
+    QLabel#logTitle { font-size: 13px; font-weight: 600; color: #495057; }
+    QLabel#logStatus { font-size: 12px; color: #6c757d; }
+    QPushButton#logToggle {
+        background: none;
+        border: none;
+        color: #0078d7;
+        font-size: 12px;
+        padding: 5px 10px;
+    }
+    QPushButton#logToggle:hover {
+        color: #005a9e;
+    }
+    QTextEdit#console {
+        font-family: 'Consolas', 'Monaco', monospace;
+        font-size: 12px;
+        background-color: #1e1e1e;
+        color: #00ff00;
+        border: none;
+        padding: 10px;
+    }
+
+    QProgressBar#busyBar {
+        border: none;
+        background-color: transparent;
+    }
+    QProgressBar#busyBar::chunk {
+        background-color: #0078d7;
+    }
+""" + _build_btn_qss()
+
+# 主题只切换调色板和下面两小段规则 (窗口与卡片背景),不再重设整张样式表
+# 卡片用浅色描边 + 加深的底边模拟阴影,代替逐帧做高斯模糊的 QGraphicsDropShadowEffect
+_LIGHT_THEME_QSS = """
+    QMainWindow {
+        background-color: #f0f2f5;
+    }
+    QFrame#card {
+        background-color: white;
+        border-radius: 8px;
+        border: 1px solid #e3e6ea;
+        border-bottom: 2px solid #d5d9de;
+    }
+"""
+
+_DARK_THEME_QSS = """
+    QMainWindow {
+        background-color: #1a1a1a;
+    }
+    QFrame#card {
+        background-color: #2d2d2d;
+        border-radius: 8px;
+        border: 1px solid #3a3a3a;
+        border-bottom: 2px solid #111111;
+    }
+"""
+
+# 深色调色板的各角色颜色,未设置样式的文字 (如 QLabel) 直接从调色板取色
+_DARK_PALETTE_COLORS = (
+    (QPalette.ColorRole.Window, "#1a1a1a"),
+    (QPalette.ColorRole.WindowText, "#e0e0e0"),
+    (QPalette.ColorRole.Base, "#2d2d2d"),
+    (QPalette.ColorRole.AlternateBase, "#353535"),
+    (QPalette.ColorRole.Text, "#e0e0e0"),
+    (QPalette.ColorRole.Button, "#2d2d2d"),
+    (QPalette.ColorRole.ButtonText, "#e0e0e0"),
+    (QPalette.ColorRole.ToolTipBase, "#2d2d2d"),
+    (QPalette.ColorRole.ToolTipText, "#e0e0e0"),
+    (QPalette.ColorRole.Highlight, "#0078d7"),
+    (QPalette.ColorRole.HighlightedText, "#ffffff"),
+)
+
+
+def _build_dark_palette():
+    palette = QPalette()
+    for role, color in _DARK_PALETTE_COLORS:
+        palette.setColor(role, QColor(color))
+    return palette
+
 
 class OTAConfigApp(QMainWindow):
+    # 推送前的字段校验规则,类加载时编译一次
+    _VALIDATORS = (
+        ("ICC_PNO", re.compile(r"^[A-Z0-9_-]+$")),
+        ("VIN", re.compile(r"^[A-Z0-9]{17}$")),
+        ("f1A1", re.compile(r"^[A-F0-9]+$")),
+        ("0525", re.compile(r"^[A-F0-9]+$")),
+    )
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("OTA Device Configuration Manager Pro")
         self.resize(1000, 700)
 
-        self.worker = None
+        # ADB 任务复用同一个单线程池,任务按提交顺序串行执行
+        self.adb_pool = QThreadPool(self)
+        self.adb_pool.setMaxThreadCount(1)
+        self.worker_signals = AdbWorkerSignals(self)
+        self.connect_worker_signals()
         self.inputs = {}
         self.is_dark_mode = False
 
-        self.input_debounce_timer = QTimer()
-        self.input_debounce_timer.setSingleShot(True)
-        self.input_debounce_timer.timeout.connect(self.apply_text_formatting)
-        self.pending_line_edit = None
-
+        # 日志先进缓冲区,50ms 内的多条消息合并为一次 append,减少文本控件重排
+        self._log_buffer = []
+        self._last_log_message = ""
+        self._log_flush_timer = QTimer(self)
+        self._log_flush_timer.setSingleShot(True)
+        self._log_flush_timer.setInterval(50)
+        self._log_flush_timer.timeout.connect(self._flush_log)
+
+        # 设备状态优先走 adb server 的 track-devices 推送,连不上时才退回 3 秒轮询
+        self._adb_sock = None
+        self._adb_notifier = None
+        self._track_buf = b""
+        # 任务执行期间收到的最新一帧,任务结束后再补做断开判断
+        self._last_device_list = None
         self.heart_timer = QTimer(self)
         self.heart_timer.timeout.connect(self.auto_check_adb)
-        self.heart_timer.start(3000)
+        if not self.start_device_tracking():
+            self.heart_timer.start(3000)
 
         self.log_expanded = False
 
+        # 主界面样式表只设置一次;两套调色板提前建好,切换主题时直接替换
+        app = QApplication.instance()
+        app.setStyleSheet(_MAIN_QSS)
+        self._light_palette = app.palette()
+        self._dark_palette = _build_dark_palette()
+
         self.setup_ui()
         self.apply_theme()
 
@@ -610,48 +1001,21 @@ class OTAConfigApp(QMainWindow):
         self.progress_bar.setRange(0, 0)
         self.progress_bar.setTextVisible(False)
         self.progress_bar.setFixedHeight(3)
-        self.progress_bar.setStyleSheet(
-            """
-            QProgressBar {
-                border: none;
-                background-color: transparent;
-            }
-            QProgressBar::chunk {
-                background-color: #0078d7;
-            }
-        """
-        )
+        self.progress_bar.setObjectName("busyBar")
         self.progress_bar.hide()
         main_layout.addWidget(self.progress_bar)
 
     def create_toolbar(self):
         """创建顶部工具栏"""
         toolbar = QFrame()
-        toolbar.setStyleSheet(
-            """
-            QFrame {
-                background-color: white;
-                border-radius: 8px;
-                padding: 10px;
-            }
-        """
-        )
+        toolbar.setObjectName("toolbar")
 
         layout = QHBoxLayout(toolbar)
         layout.setContentsMargins(15, 10, 15, 10)
 
         # Logo 和标题
         logo_label = QLabel("OTA PRO")
-        logo_label.setStyleSheet(
-            """
-            font-size: 18px;
-            font-weight: bold;
-            color: #0078d7;
-            padding: 5px 10px;
-            background: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #e3f2fd, stop:1 transparent);
-            border-radius: 5px;
-        """
-        )
+        logo_label.setObjectName("logoLabel")
         layout.addWidget(logo_label)
 
         # 状态指示器
@@ -662,26 +1026,7 @@ class OTAConfigApp(QMainWindow):
 
         # 主题切换
         self.theme_toggle = QCheckBox("深色模式")
-        self.theme_toggle.setStyleSheet(
-            """
-            QCheckBox {
-                font-size: 12px;
-                color: #666;
-                spacing: 5px;
-            }
-            QCheckBox::indicator {
-                width: 40px;
-                height: 20px;
-                border-radius: 10px;
-            }
-            QCheckBox::indicator:unchecked {
-                background-color: #ccc;
-            }
-            QCheckBox::indicator:checked {
-                background-color: #0078d7;
-            }
-        """
-        )
+        self.theme_toggle.setObjectName("themeToggle")
         self.theme_toggle.toggled.connect(self.toggle_theme)
         layout.addWidget(self.theme_toggle)
 
@@ -696,29 +1041,13 @@ class OTAConfigApp(QMainWindow):
         """创建设备信息卡片"""
         card = ModernCard("设备状态")
 
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(15)
-        shadow.setXOffset(0)
-        shadow.setYOffset(2)
-        shadow.setColor(QColor(0, 0, 0, 30))
-        card.setGraphicsEffect(shadow)
-
         layout = card.layout()
 
         # 设备信息显示区域
         info_text = QLabel(
             "等待连接设备...\n\n请使用 USB 数据线连接车机，\n并确保已开启 ADB 调试模式。"
         )
-        info_text.setStyleSheet(
-            """
-            font-size: 13px;
-            color: #666;
-            line-height: 1.6;
-            padding: 20px;
-            background-color: #f8f9fa;
-            border-radius: 6px;
-        """
-        )
+        info_text.setObjectName("deviceInfo")
         info_text.setWordWrap(True)
         info_text.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(info_text)
@@ -744,13 +1073,6 @@ class OTAConfigApp(QMainWindow):
         self.config_card = ModernCard("设备配置")
         self.config_card.setEnabled(False)
 
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(15)
-        shadow.setXOffset(0)
-        shadow.setYOffset(2)
-        shadow.setColor(QColor(0, 0, 0, 30))
-        self.config_card.setGraphicsEffect(shadow)
-
         layout = self.config_card.layout()
 
         # 表单区域
@@ -769,12 +1091,18 @@ class OTAConfigApp(QMainWindow):
 
         for key, placeholder in fields:
             input_field = ModernInput(placeholder)
-            input_field.textChanged.connect(
-                lambda text, obj=input_field: self.handle_text_change(obj)
+            # 非法字符在键入时直接拦截,大写转换在编辑结束 (回车/失焦) 时完成
+            input_field.setValidator(
+                QRegularExpressionValidator(
+                    QRegularExpression(_FIELD_INPUT_PATTERNS[key]), input_field
+                )
+            )
+            input_field.editingFinished.connect(
+                lambda obj=input_field: self.format_input(obj)
             )
 
             label = QLabel(f"{key}:")
-            label.setStyleSheet("font-size: 13px; font-weight: 500; color: #495057;")
+            label.setObjectName("fieldLabel")
 
             form_layout.addRow(label, input_field)
             self.inputs[key] = input_field
@@ -799,14 +1127,7 @@ class OTAConfigApp(QMainWindow):
     def create_log_panel(self):
         """创建可折叠日志面板"""
         panel = QFrame()
-        panel.setStyleSheet(
-            """
-            QFrame {
-                background-color: white;
-                border-radius: 8px;
-            }
-        """
-        )
+        panel.setObjectName("logPanel")
 
         layout = QVBoxLayout(panel)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -814,46 +1135,24 @@ class OTAConfigApp(QMainWindow):
 
         # 日志头部
         header = QFrame()
-        header.setStyleSheet(
-            """
-            QFrame {
-                background-color: #f8f9fa;
-                border-top-left-radius: 8px;
-                border-top-right-radius: 8px;
-                padding: 10px 15px;
-            }
-        """
-        )
+        header.setObjectName("logHeader")
         header.setFixedHeight(45)
 
         header_layout = QHBoxLayout(header)
         header_layout.setContentsMargins(10, 5, 10, 5)
 
         log_title = QLabel("运行日志")
-        log_title.setStyleSheet("font-size: 13px; font-weight: 600; color: #495057;")
+        log_title.setObjectName("logTitle")
         header_layout.addWidget(log_title)
 
         self.log_status = QLabel("准备就绪")
-        self.log_status.setStyleSheet("font-size: 12px; color: #6c757d;")
+        self.log_status.setObjectName("logStatus")
         header_layout.addWidget(self.log_status)
 
         header_layout.addStretch()
 
         self.btn_toggle_log = QPushButton("展开 ▼")
-        self.btn_toggle_log.setStyleSheet(
-            """
-            QPushButton {
-                background: none;
-                border: none;
-                color: #0078d7;
-                font-size: 12px;
-                padding: 5px 10px;
-            }
-            QPushButton:hover {
-                color: #005a9e;
-            }
-        """
-        )
+        self.btn_toggle_log.setObjectName("logToggle")
         self.btn_toggle_log.clicked.connect(self.toggle_log_panel)
         header_layout.addWidget(self.btn_toggle_log)
 
@@ -863,18 +1162,11 @@ class OTAConfigApp(QMainWindow):
         self.console = QTextEdit()
         self.console.setReadOnly(True)
         self.console.setMaximumHeight(0)
-        self.console.setStyleSheet(
-            """
-            QTextEdit {
-                font-family: 'Consolas', 'Monaco', monospace;
-                font-size: 12px;
-                background-color: #1e1e1e;
-                color: #00ff00;
-                border: none;
-                padding: 10px;
-            }
-        """
-        )
+        self.console.setObjectName("console")
+        # 日志只保留最近 1000 行,超出部分由文档自动裁掉
+        self.console.document().setMaximumBlockCount(1000)
+        # 写日志复用同一个光标,始终在文档末尾插入
+        self._log_cursor = QTextCursor(self.console.document())
         layout.addWidget(self.console)
 
         return panel
@@ -896,48 +1188,16 @@ class OTAConfigApp(QMainWindow):
         self.apply_theme()
 
     def apply_theme(self):
-        """应用主题样式"""
+        """应用主题:替换调色板,窗口上只保留背景相关的少量规则"""
         if self.is_dark_mode:
-            # 深色主题
-            self.setStyleSheet(
-                """
-                QMainWindow {
-                    background-color: #1a1a1a;
-                }
-                QFrame#card {
-                    background-color: #2d2d2d;
-                    border-radius: 8px;
-                }
-                QLabel {
-                    color: #e0e0e0;
-                }
-            """
-            )
+            QApplication.instance().setPalette(self._dark_palette)
+            self.setStyleSheet(_DARK_THEME_QSS)
         else:
-            # 浅色主题
-            self.setStyleSheet(
-                """
-                QMainWindow {
-                    background-color: #f0f2f5;
-                }
-                QFrame#card {
-                    background-color: white;
-                    border-radius: 8px;
-                }
-            """
-            )
-
-    def handle_text_change(self, line_edit):
-        """防抖处理:延迟300ms后再格式化"""
-        self.pending_line_edit = line_edit
-        self.input_debounce_timer.start(300)
+            QApplication.instance().setPalette(self._light_palette)
+            self.setStyleSheet(_LIGHT_THEME_QSS)
 
-    def apply_text_formatting(self):
-        """实际执行文本格式化"""
-        if not self.pending_line_edit:
-            return
-
-        line_edit = self.pending_line_edit
+    def format_input(self, line_edit):
+        """编辑结束时统一转为大写并去除空格"""
         current_text = line_edit.text()
         processed_text = current_text.upper().replace(" ", "")
 
@@ -950,7 +1210,7 @@ class OTAConfigApp(QMainWindow):
 
     def auto_check_adb(self):
         """后台静默检查 ADB 状态"""
-        if self.worker and self.worker.isRunning():
+        if self.is_busy():
             return
 
         if self.progress_bar.isHidden():
@@ -964,7 +1224,7 @@ class OTAConfigApp(QMainWindow):
                 )
 
                 is_connected = "device" in process.stdout
-                current_connected = self.status_indicator.status == "connected"
+                current_connected = self.status_indicator.is_connected
 
                 if not is_connected and current_connected:
                     self.status_indicator.set_status(False)
@@ -974,7 +1234,108 @@ class OTAConfigApp(QMainWindow):
             except (subprocess.TimeoutExpired, Exception):
                 pass
 
+    def start_device_tracking(self):
+        """连接 adb server 并订阅 host:track-devices,设备变化时由 server 主动推送"""
+        try:
+            sock = socket.create_connection(ADB_SERVER_ADDR, timeout=1.0)
+        except OSError:
+            return False
+
+        try:
+            request = b"host:track-devices"
+            sock.sendall(b"%04x%s" % (len(request), request))
+            if sock.recv(4) != b"OKAY":
+                sock.close()
+                return False
+        except OSError:
+            sock.close()
+            return False
+
+        sock.setblocking(False)
+        self._adb_sock = sock
+        self._track_buf = b""
+        self._adb_notifier = QSocketNotifier(
+            sock.fileno(), QSocketNotifier.Type.Read, self
+        )
+        self._adb_notifier.activated.connect(self.on_track_devices_ready)
+        return True
+
+    def stop_device_tracking(self):
+        if self._adb_notifier is not None:
+            self._adb_notifier.setEnabled(False)
+            self._adb_notifier.deleteLater()
+            self._adb_notifier = None
+        if self._adb_sock is not None:
+            self._adb_sock.close()
+            self._adb_sock = None
+
+    def on_track_devices_ready(self):
+        """读取推送帧: 4 位十六进制长度 + 设备列表"""
+        try:
+            chunk = self._adb_sock.recv(4096)
+        except BlockingIOError:
+            return
+        except OSError:
+            chunk = b""
+
+        if not chunk:
+            # adb server 退出 (例如 kill-server),退回轮询
+            self.stop_device_tracking()
+            self.log("[系统] ADB 服务连接断开,改为定时检测设备状态")
+            self.heart_timer.start(3000)
+            return
+
+        self._track_buf += chunk
+        latest = None
+        while len(self._track_buf) >= 4:
+            try:
+                length = int(self._track_buf[:4], 16)
+            except ValueError:
+                self._track_buf = b""
+                return
+            if len(self._track_buf) < 4 + length:
+                break
+            latest = self._track_buf[4 : 4 + length].decode("utf-8", errors="replace")
+            self._track_buf = self._track_buf[4 + length :]
+
+        # 同一批数据里只需处理最后一帧
+        if latest is not None:
+            self.on_device_list(latest)
+
+    def on_device_list(self, device_list):
+        if self.is_busy():
+            # Root 过程中 adbd 会重启,中间状态交给任务自身处理;
+            # server 只在变化时推送,先记下这一帧,空闲后再判断
+            self._last_device_list = device_list
+            return
+        self._last_device_list = None
+
+        is_connected = _DEVICE_RE.search(device_list) is not None
+        current_connected = self.status_indicator.is_connected
+
+        if not is_connected and current_connected:
+            AdbWorker._last_ok_ts = 0.0
+            self.status_indicator.set_status(False)
+            self.toggle_loading(False)
+            self.log("[系统] 检测到设备断开连接")
+
+    def recheck_device_list(self):
+        """任务结束后处理期间被搁置的设备帧,线程池尚未空闲时稍后再试"""
+        if self._last_device_list is None:
+            return
+        if self.is_busy():
+            QTimer.singleShot(200, self.recheck_device_list)
+            return
+        self.on_device_list(self._last_device_list)
+
+    def closeEvent(self, event):
+        self.stop_device_tracking()
+        super().closeEvent(event)
+
     def import_local_config(self):
+        # 文件对话框仅在导入时用到,延迟到此处导入
+        from PyQt6.QtWidgets import QFileDialog
+
         file_path, _ = QFileDialog.getOpenFileName(
             self, "选择本地配置文件", "", "JSON Files (*.json);;Text Files (*.txt)"
         )
@@ -988,11 +1349,31 @@ class OTAConfigApp(QMainWindow):
                 QMessageBox.critical(self, "导入失败", f"无效的 JSON 文件: {str(e)}")
 
     def log(self, message):
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.console.append(f"[{timestamp}] {message}")
+        timestamp = time.strftime("%H:%M:%S")
+        self._log_buffer.append(f"[{timestamp}] {message}")
+        self._last_log_message = message
+        if not self._log_flush_timer.isActive():
+            self._log_flush_timer.start()
+
+    def _flush_log(self):
+        if not self._log_buffer:
+            return
+        text = "\n".join(self._log_buffer)
+        self._log_buffer.clear()
+        if not self.console.document().isEmpty():
+            text = "\n" + text
+
+        # 整批写入期间暂停重绘,结束后统一刷新一次
+        self.console.setUpdatesEnabled(False)
+        cursor = self._log_cursor
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertText(text)
+        self.console.setTextCursor(cursor)
+        self.console.ensureCursorVisible()
+        self.console.setUpdatesEnabled(True)
+
+        message = self._last_log_message
         self.log_status.setText(message[:50] + "..." if len(message) > 50 else message)
-        sb = self.console.verticalScrollBar()
-        sb.setValue(sb.maximum())
 
     def toggle_loading(self, is_loading):
         if is_loading:
@@ -1004,31 +1385,34 @@ class OTAConfigApp(QMainWindow):
         else:
             self.progress_bar.hide()
             self.btn_connect.setEnabled(True)
-            is_connected = self.status_indicator.status == "connected"
+            is_connected = self.status_indicator.is_connected
             self.btn_pull.setEnabled(is_connected)
             self.btn_push.setEnabled(is_connected)
             self.config_card.setEnabled(is_connected)
+            self.recheck_device_list()
+
+    def is_busy(self):
+        return self.adb_pool.activeThreadCount() > 0
+
+    def submit_task(self, task_type, data=None):
+        self.adb_pool.start(AdbWorker(task_type, self.worker_signals, data=data))
 
     def start_connect(self):
-        if self.worker and self.worker.isRunning():
+        if self.is_busy():
             self.log("[警告] 操作正在进行中,请稍候...")
             return
 
-        self.worker = AdbWorker("connect")
-        self.connect_worker_signals()
-        self.worker.start()
+        self.submit_task("connect")
 
     def start_pull(self):
-        if self.worker and self.worker.isRunning():
+        if self.is_busy():
             self.log("[警告] 操作正在进行中,请稍候...")
             return
 
-        self.worker = AdbWorker("pull")
-        self.connect_worker_signals()
-        self.worker.start()
+        self.submit_task("pull")
 
     def start_push(self):
-        if self.worker and self.worker.isRunning():
+        if self.is_busy():
             self.log("[警告] 操作正在进行中,请稍候...")
             return
 
@@ -1047,36 +1431,19 @@ class OTAConfigApp(QMainWindow):
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            self.worker = AdbWorker("push", data=data)
-            self.connect_worker_signals()
-            self.worker.start()
+            self.submit_task("push", data=data)
 
     def connect_worker_signals(self):
-        try:
-            self.worker.log_signal.disconnect()
-            self.worker.progress_signal.disconnect()
-            self.worker.data_loaded_signal.disconnect()
-            self.worker.operation_finished_signal.disconnect()
-        except TypeError:
-            pass
-
-        self.worker.log_signal.connect(self.log)
-        self.worker.progress_signal.connect(self.toggle_loading)
-        self.worker.data_loaded_signal.connect(self.populate_ui)
-        self.worker.operation_finished_signal.connect(self.on_operation_finished)
+        self.worker_signals.log_signal.connect(self.log)
+        self.worker_signals.progress_signal.connect(self.toggle_loading)
+        self.worker_signals.data_loaded_signal.connect(self.populate_ui)
+        self.worker_signals.operation_finished_signal.connect(self.on_operation_finished)
 
     def validate_data(self, data):
         """符号级校验逻辑"""
-        patterns = {
-            "ICC_PNO": r"^[A-Z0-9_-]+$",
-            "VIN": r"^[A-Z0-9]{17}$",
-            "f1A1": r"^[A-F0-9]+$",
-            "0525": r"^[A-F0-9]+$",
-        }
-
-        for key, pattern in patterns.items():
+        for key, pattern in self._VALIDATORS:
             val = data.get(key, "")
-            if not re.match(pattern, val):
+            if not pattern.match(val):
                 return (
                     False,
                     f"字段 [{key}] 格式非法!\n当前输入: {val}\n\n规则:仅限大写字母、数字、-、_",
@@ -1086,17 +1453,27 @@ class OTAConfigApp(QMainWindow):
 
     def populate_ui(self, data):
         """将 JSON 数据填入输入框"""
-        for key, val in data.items():
-            if key in self.inputs:
-                self.inputs[key].setText(str(val))
-            else:
-                self.log(f"[提示] 发现未定义字段: {key} = {val}")
+        # 批量填充期间暂停卡片重绘,结束后统一刷新一次
+        self.config_card.setUpdatesEnabled(False)
+        try:
+            for key, val in data.items():
+                line_edit = self.inputs.get(key)
+                if line_edit is None:
+                    self.log(f"[提示] 发现未定义字段: {key} = {val}")
+                    continue
+                # 值未变化时跳过 setText,避免多余的文本重排
+                new_text = str(val)
+                if line_edit.text() != new_text:
+                    line_edit.setText(new_text)
+        finally:
+            self.config_card.setUpdatesEnabled(True)
 
     def on_operation_finished(self, success, message):
         if success:
             if message == "Connected":
                 self.status_indicator.set_status(True)
-                self.start_pull()
+                # 连接任务此时可能尚未完全退出,直接排入线程池,在其后执行读取
+                self.submit_task("pull")
             elif message == "Push Success":
                 QMessageBox.information(
                     self, "成功", "配置文件已成功推送到设备并生效。"
@@ -1110,6 +1487,8 @@ class OTAConfigApp(QMainWindow):
 
 
 if __name__ == "__main__":
+    from PyQt6.QtWidgets import QStyleFactory
+
     app = QApplication(sys.argv)
     app.setStyle(QStyleFactory.create("Fusion"))
 
@@ -1,109 +1,202 @@
 import os
 import re
 import time
+import signal
+import operator
+import threading
 import subprocess
-from concurrent.futures import ThreadPoolExecutor
 from rich.live import Live
 from rich.table import Table
 from rich.panel import Panel
 from rich.layout import Layout
 from rich.console import Console
 
+# 白名单行尾的包名 (前面可能带有来源标记等杂质)
+_PKG_RE = re.compile(r'([a-zA-Z0-9._]+)$')
+# toybox top 的进程行：PID USER PR NI VIRT RES SHR S %CPU %MEM TIME+ ARGS
+# 分组依次为 PID、RES、%CPU、进程名 (ARGS 第一段)
+_TOP_LINE_RE = re.compile(
+    r'^\s*(\d+)\s+\S+\s+\S+\s+\S+\s+\S+\s+([\d,.]+[MG]?)\s+\S+\s+\S+\s+(\d+\.?\d*)\s+\S+\s+\S+\s+(\S+)')
+# uptime 的 1/5/15 分钟负载、df 的使用率、top 头部的内存汇总
+_LOAD_RE = re.compile(r"average:\s+([\d.]+),?\s+([\d.]+),?\s+([\d.]+)")
+_STORAGE_RE = re.compile(r"(\d+)%")
+_MEM_RE = re.compile(r"Mem:\s+([\d,]+)K total,\s+([\d,]+)K used")
+# top 内存单位 -> MB 换算系数，无单位时按 KB 处理
+_MEM_UNIT_TO_MB = {"G": 1024.0, "M": 1.0, "K": 1 / 1024}
+
 class IVIIndustrialMonitor:
     def __init__(self, whitelist_path="whitelist.txt"):
         self.console = Console()
         self.device_id = self._get_device()
+        # 常驻 adb shell 会话，所有采集命令复用同一条连接
+        self._shell = None
+        self._shell_seq = 0
+        self._shell_lock = threading.Lock()
         self.whitelist = self._load_whitelist(whitelist_path)
-        # 初始化数据模型
+        # 采集线程的刷新间隔 (秒)
+        self.interval = 1
+        # 退出信号：采集与渲染循环都在该事件上等待，置位后立即结束
+        self._stop = threading.Event()
+        # 数据版本号：采集线程每产出一份新数据加一并置位 _new_data，渲染端据此决定是否重建表格
+        self._metrics_version = 0
+        self._rendered_version = -1
+        self._new_data = threading.Event()
+        # 初始化数据模型：采集线程整体替换 self.metrics，渲染线程只读取快照
+        self._metrics_lock = threading.Lock()
         self.metrics = {
             "system": {"load": ("0.00", "0.00", "0.00"), "mem_pct": 0, "mem_raw": "0/0", "storage": "N/A"},
             "apps": []
         }
+        # 布局骨架只搭建一次，每次刷新只替换三个区域的内容
+        self._layout = Layout()
+        self._layout.split_column(Layout(name="header", size=3), Layout(name="main", ratio=1))
+        self._layout["main"].split_row(Layout(name="sys", ratio=1), Layout(name="app", ratio=2.5))
 
     def _load_whitelist(self, path):
         """专业解析：清洗包名，确保不含源标记"""
         if not os.path.exists(path): return []
         with open(path, 'r', encoding='utf-8') as f:
-            # 这里的正则专门过滤 这种杂质
-            return [re.search(r'([a-zA-Z0-9._]+)$', line.strip()).group(1)
-                    for line in f if re.search(r'([a-zA-Z0-9._]+)$', line.strip())]
+            lines = f.read().splitlines()
+        # 这里的正则专门过滤 这种杂质，每行只匹配一次
+        return [m.group(1) for line in lines if (m := _PKG_RE.search(line.strip()))]
 
     def _get_device(self):
-        res = subprocess.run("adb devices", shell=True, capture_output=True, text=True)
+        res = subprocess.run(["adb", "devices"], capture_output=True, text=True)
         devices = re.findall(r'^(\S+)\tdevice', res.stdout, re.MULTILINE)
         return devices[0] if devices else None
 
-    def _adb_shell(self, cmd):
-        """通过 ADB 执行命令，支持 Root 自动检测"""
+    def _open_shell(self):
+        self._shell = subprocess.Popen(
+            ["adb", "-s", self.device_id, "shell"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            encoding="utf-8", errors="ignore", bufsize=1)
+
+    def _close_shell(self):
+        shell, self._shell = self._shell, None
+        if shell is not None and shell.poll() is None:
+            shell.kill()
+            shell.wait()
+
+    def _adb_shell(self, cmd, timeout=4):
+        """在常驻 adb shell 中执行命令，读到结束标记为止；超时或断开时返回空串"""
         if not self.device_id: return ""
-        # 尝试使用 su -c 以获得最高权限输出
-        full_cmd = f"adb -s {self.device_id} shell \"{cmd}\""
-        try:
-            res = subprocess.run(full_cmd, shell=True, capture_output=True, text=True, timeout=4)
-            return res.stdout
-        except:
+        with self._shell_lock:
+            if self._shell is None or self._shell.poll() is not None:
+                try:
+                    self._open_shell()
+                except OSError:
+                    return ""
+            # 标记带序号，避免上一条被中断命令的残留输出被误认
+            self._shell_seq += 1
+            marker = f"__EOF_{self._shell_seq}__"
+            # 命令卡住时杀掉会话，stdout 随即读到 EOF
+            watchdog = threading.Timer(timeout, self._shell.kill)
+            watchdog.start()
+            lines = []
+            try:
+                self._shell.stdin.write(f"{cmd}\necho {marker}\n")
+                self._shell.stdin.flush()
+                for line in self._shell.stdout:
+                    pos = line.find(marker)
+                    if pos >= 0:
+                        # 输出末尾无换行时，标记与输出位于同一行
+                        lines.append(line[:pos])
+                        return "".join(lines)
+                    lines.append(line)
+            except OSError:
+                pass
+            finally:
+                watchdog.cancel()
+            # 会话已断开，下次调用时重建
+            self._close_shell()
             return ""
 
     def collect_all_data(self):
         """工业级一键采集：聚合 top 命令以提高性能"""
+        # 三条命令合并成一次 adb shell 调用，用分隔行切分各自的输出
+        out = self._adb_shell("uptime; echo ===DF===; df -h /data; echo ===TOP===; top -b -n 1")
+        uptime, _, rest = out.partition("===DF===")
+        df, _, top_data = rest.partition("===TOP===")
+        # 在副本上更新，本轮解析失败的字段沿用上一轮的值
+        system = dict(self.metrics["system"])
+
         # 1. 采集系统负载
-        uptime = self._adb_shell("uptime")
-        load = re.search(r"average:\s+([\d.]+),?\s+([\d.]+),?\s+([\d.]+)", uptime)
-        if load: self.metrics["system"]["load"] = load.groups()
+        load = _LOAD_RE.search(uptime)
+        if load: system["load"] = load.groups()
 
         # 2. 采集存储
-        df = self._adb_shell("df -h /data")
-        storage = re.search(r"(\d+)%", df)
-        if storage: self.metrics["system"]["storage"] = f"{storage.group(1)}%"
+        storage = _STORAGE_RE.search(df)
+        if storage: system["storage"] = f"{storage.group(1)}%"
 
         # 3. 核心：通过 top 一次性抓取所有进程数据 (非常快)
-        # -b: 批处理模式, -n 1: 刷新一次, -o: 自定义输出字段 (RES是物理内存, CPU是占用率)
-        top_data = self._adb_shell("top -b -n 1")
+        # -b: 批处理模式, -n 1: 刷新一次 (RES是物理内存, CPU是占用率)
 
         # 4. 解析系统总内存 (从 top 头部获取)
-        mem_line = re.search(r"Mem:\s+([\d,]+)K total,\s+([\d,]+)K used", top_data)
+        mem_line = _MEM_RE.search(top_data)
         if mem_line:
             total_k = int(mem_line.group(1).replace(',', ''))
             used_k = int(mem_line.group(2).replace(',', ''))
-            self.metrics["system"]["mem_pct"] = round((used_k / total_k) * 100, 1)
-            self.metrics["system"]["mem_raw"] = f"{used_k//1024}/{total_k//1024} MB"
+            system["mem_pct"] = round((used_k / total_k) * 100, 1)
+            system["mem_raw"] = f"{used_k//1024}/{total_k//1024} MB"
 
-        # 5. 匹配白名单进程
+        # 5. 匹配白名单进程：逐行解析 top 一次，按包名查表
+        wl = set(self.whitelist)
+        seen = set()
         app_list = []
-        for pkg in self.whitelist:
-            # 寻找匹配包名的行 (top 输出通常包含包名或进程名)
-            # 修正正则以适应 8155 的输出格式
-            pattern = fr"\s*(\d+)\s+.*?\s+([\d,.]+[MG]?)\s+.*?\s+(\d+[.]?\d*)\s+.*?\s+{re.escape(pkg)}"
-            match = re.search(pattern, top_data)
-            if match:
-                res_mem = match.group(2)
-                cpu_val = match.group(3)
-                # 转换内存单位 (如果是 'G' 或 'M')
-                mem_mb = self._parse_mem_to_mb(res_mem)
-                app_list.append({"pkg": pkg, "cpu": f"{cpu_val}%", "mem": f"{mem_mb} MB"})
-
-        self.metrics["apps"] = sorted(app_list, key=lambda x: float(x['mem'].split()[0]), reverse=True)
+        for line in top_data.splitlines():
+            match = _TOP_LINE_RE.match(line)
+            if not match: continue
+            # 子进程形如 "com.xxx:remote"，归到主包名下
+            pkg = match.group(4).split(':', 1)[0]
+            # 同一包名只取 top 中排在最前的一行
+            if pkg not in wl or pkg in seen: continue
+            seen.add(pkg)
+            res_mem = match.group(2)
+            cpu_val = match.group(3)
+            # 转换内存单位 (如果是 'G' 或 'M')
+            mem_mb = self._parse_mem_to_mb(res_mem)
+            # 保存数值，显示格式在渲染时再生成
+            app_list.append({"pkg": pkg, "cpu": float(cpu_val), "mem_mb": mem_mb})
+
+        apps = sorted(app_list, key=operator.itemgetter("mem_mb"), reverse=True)
+        with self._metrics_lock:
+            self.metrics = {"system": system, "apps": apps}
+            self._metrics_version += 1
+        self._new_data.set()
+
+    def _collector(self):
+        """后台采集线程：adb 阻塞期间不影响界面刷新"""
+        while not self._stop.is_set():
+            self.collect_all_data()
+            self._stop.wait(self.interval)
 
     def _parse_mem_to_mb(self, mem_str):
         """将 top 的内存字符串 (如 1.2G, 500M, 123456) 统一转换为 MB"""
+        mem_str = mem_str.replace(',', '')
+        factor = _MEM_UNIT_TO_MB.get(mem_str[-1:])
         try:
-            mem_str = mem_str.replace(',', '')
-            if 'G' in mem_str: return round(float(mem_str.replace('G', '')) * 1024, 1)
-            if 'M' in mem_str: return round(float(mem_str.replace('M', '')), 1)
-            return round(float(mem_str) / 1024, 1) # 默认是 KB
-        except:
+            if factor is None:
+                return round(float(mem_str) / 1024, 1) # 默认是 KB
+            return round(float(mem_str[:-1]) * factor, 1)
+        except ValueError:
             return 0.0
 
     def generate_dashboard(self):
-        layout = Layout()
-        layout.split_column(Layout(name="header", size=3), Layout(name="main", ratio=1))
-        layout["main"].split_row(Layout(name="sys", ratio=1), Layout(name="app", ratio=2.5))
+        self._update_header()
+        self._update_body()
+        return self._layout
+
+    def _update_header(self):
+        self._layout["header"].update(Panel(f"[bold cyan]IVI INDUSTRIAL MONITOR[/] | Device: [green]{self.device_id}[/] | {time.strftime('%H:%M:%S')}", border_style="cyan"))
 
-        # Header
-        layout["header"].update(Panel(f"[bold cyan]IVI INDUSTRIAL MONITOR[/] | Device: [green]{self.device_id}[/] | {time.strftime('%H:%M:%S')}", border_style="cyan"))
+    def _update_body(self):
+        """按最新数据重建系统信息与进程表"""
+        with self._metrics_lock:
+            metrics, self._rendered_version = self.metrics, self._metrics_version
+        layout = self._layout
 
         # Sys Info
-        sys = self.metrics["system"]
+        sys = metrics["system"]
         l1, l5, l15 = sys["load"]
         sys_table = Table(show_header=False, box=None)
         sys_table.add_row("CPU Load:", f"[bold yellow]{l1}[/] [dim]/ {l5} / {l15}[/]")
@@ -112,27 +205,48 @@ class IVIIndustrialMonitor:
         layout["sys"].update(Panel(sys_table, title="System Health", border_style="blue"))
 
         # App Info
-        app_table = Table(title=f"Monitoring {len(self.metrics['apps'])} Active Processes (from Whitelist)", expand=True)
+        app_table = Table(title=f"Monitoring {len(metrics['apps'])} Active Processes (from Whitelist)", expand=True)
         app_table.add_column("Package Name", style="cyan", ratio=3)
         app_table.add_column("CPU %", style="green", justify="right", ratio=1)
         app_table.add_column("Memory (RES)", style="magenta", justify="right", ratio=1.5)
 
-        for app in self.metrics["apps"][:18]:
-            app_table.add_row(app["pkg"], app["cpu"], app["mem"])
+        for app in metrics["apps"][:18]:
+            app_table.add_row(app["pkg"], f"{app['cpu']:.1f}%", f"{app['mem_mb']:.1f} MB")
 
         # 如果列表为空，显示提示
-        if not self.metrics["apps"]:
+        if not metrics["apps"]:
             app_table.add_row("[yellow]Searching for whitelisted apps...[/]", "-", "-")
 
         layout["app"].update(Panel(app_table, border_style="green"))
-        return layout
+
+    def stop(self):
+        """通知采集与渲染循环退出"""
+        self._stop.set()
+        self._new_data.set()
 
     def run(self):
-        with Live(self.generate_dashboard(), refresh_per_second=1, screen=True) as live:
-            while True:
-                self.collect_all_data()
-                live.update(self.generate_dashboard())
-                time.sleep(1)
+        # Ctrl-C 只置位退出事件，由循环自行收尾
+        prev_handler = signal.signal(signal.SIGINT, lambda *_: self.stop())
+        collector = threading.Thread(target=self._collector, daemon=True)
+        collector.start()
+        try:
+            # 关闭 Live 的自动刷新，只在下面的循环里按需重绘
+            with Live(self.generate_dashboard(), auto_refresh=False, screen=True) as live:
+                while not self._stop.is_set():
+                    # 新数据到达立即重绘；否则最多等 1 秒，只刷新头部时钟
+                    self._new_data.wait(1.0)
+                    self._new_data.clear()
+                    if self._metrics_version != self._rendered_version:
+                        self._update_body()
+                    self._update_header()
+                    live.refresh()
+        finally:
+            self.stop()
+            signal.signal(signal.SIGINT, prev_handler)
+            # 等采集线程退出 (单条命令最多被看门狗卡 4 秒)，再在锁内关闭会话
+            collector.join(timeout=5)
+            with self._shell_lock:
+                self._close_shell()
 
 if __name__ == "__main__":
     IVIIndustrialMonitor().run()
\ No newline at end of file
@@ -3,8 +3,11 @@ import subprocess
 import time
 import sys
 import re
+import shlex
+import queue
 import threading
 import platform
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import List, Optional, Tuple, Dict
 
@@ -21,6 +24,7 @@ try:
     from rich.align import Align
     from rich.live import Live
     from rich.text import Text
+    from rich.markup import escape
     from rich import box
 except ImportError:
     print("\n[!] 缺失组件: rich. 请执行: pip install rich")
@@ -29,20 +33,39 @@ except ImportError:
 # ==========================================
 # 1. 驱动层: 稳健 ADB 引擎
 # ==========================================
+_GETPROP_RE = re.compile(r'\[([^\]]+)\]:\s*\[([^\]]*)\]')
+_GETPROP_TTL = 30  # 属性表缓存秒数, 系统属性很少变化
+
+def _split_command(command: str) -> List[str]:
+    """把命令字符串拆成 argv, 不经过本机 shell"""
+    if os.name != "nt":
+        return shlex.split(command)
+    # Windows 路径中的反斜杠不能当转义符, 用非 POSIX 模式拆分后再去掉外层引号
+    args = []
+    for token in shlex.split(command, posix=False):
+        if len(token) >= 2 and token[0] == token[-1] and token[0] in "\"'":
+            token = token[1:-1]
+        args.append(token)
+    return args
+
 class AdbDriver:
     def __init__(self, device_id: Optional[str] = None):
         self.device_id = device_id
         self.timeout = 20
+        # 常驻 adb shell, 连续查询时复用同一个进程
+        self._shell: Optional[subprocess.Popen] = None
+        self._shell_device: Optional[str] = None
+        self._shell_seq = 0
+        self._shell_lock = threading.Lock()
+        self._props_cache: Optional[Tuple[float, Optional[str], Dict[str, str]]] = None
 
     def run(self, command: str, timeout: int = None) -> Tuple[bool, str]:
         target_timeout = timeout if timeout is not None else self.timeout
-        prefix = f"adb -s {self.device_id} " if self.device_id else "adb "
-        full_cmd = prefix + command
+        prefix = ["adb", "-s", self.device_id] if self.device_id else ["adb"]
 
         try:
             process = subprocess.run(
-                full_cmd,
-                shell=True,
+                prefix + _split_command(command),
                 capture_output=True,
                 text=True,
                 timeout=target_timeout,
@@ -58,6 +81,84 @@ class AdbDriver:
         except Exception as e:
             return False, str(e)
 
+    def open_shell(self) -> subprocess.Popen:
+        """打开 (或复用) 常驻 adb shell, 设备切换后自动重开"""
+        if self._shell and self._shell.poll() is None and self._shell_device == self.device_id:
+            return self._shell
+        self.close_shell()
+        prefix = ["adb", "-s", self.device_id] if self.device_id else ["adb"]
+        self._shell = subprocess.Popen(
+            prefix + ["shell"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            encoding='utf-8',
+            errors='ignore',
+            bufsize=1
+        )
+        self._shell_device = self.device_id
+        return self._shell
+
+    def close_shell(self):
+        proc, self._shell = self._shell, None
+        if proc is None: return
+        try:
+            if proc.poll() is None:
+                proc.stdin.write("exit\n")
+                proc.stdin.flush()
+                proc.wait(timeout=1)
+        except Exception:
+            proc.kill()
+
+    def shell_eval(self, cmd: str, timeout: int = None) -> Tuple[bool, str]:
+        """在常驻 shell 中执行命令, 以哨兵行判断输出结束, 失败时重开 shell 重试一次"""
+        target_timeout = timeout if timeout is not None else self.timeout
+        with self._shell_lock:
+            for _ in range(2):
+                try:
+                    proc = self.open_shell()
+                except Exception as e:
+                    return False, str(e)
+                self._shell_seq += 1
+                sentinel = f"__END_{self._shell_seq}_"
+                # 超时由看门狗杀掉 shell, readline 随即返回 EOF
+                expired = threading.Event()
+                watchdog = threading.Timer(target_timeout, lambda: (expired.set(), proc.kill()))
+                watchdog.start()
+                try:
+                    proc.stdin.write(f"{cmd}\necho {sentinel}$?__\n")
+                    proc.stdin.flush()
+                    end_re = re.compile(re.escape(sentinel) + r"(\d+)__")
+                    lines = []
+                    for line in proc.stdout:
+                        # 输出末尾没有换行时哨兵会接在最后一行后面
+                        m = end_re.search(line)
+                        if m:
+                            lines.append(line[:m.start()])
+                            return (m.group(1) == "0", "\n".join(lines).strip())
+                        lines.append(line.rstrip("\r\n"))
+                except (OSError, ValueError):
+                    pass
+                finally:
+                    watchdog.cancel()
+                self.close_shell()
+                if expired.is_set(): return False, "TIMEOUT_ERROR"
+                # shell 意外退出 (如 adb root 后 adbd 重启), 重开后再试一次
+            return False, "SHELL_ERROR"
+
+    def getprop_all(self, refresh: bool = False) -> Dict[str, str]:
+        """一次 getprop 拉取全部属性, 按设备缓存 _GETPROP_TTL 秒"""
+        cache = self._props_cache
+        if (not refresh and cache and cache[1] == self.device_id
+                and time.monotonic() - cache[0] < _GETPROP_TTL):
+            return cache[2]
+        s, out = self.shell_eval("getprop")
+        if not s: return {}
+        props = dict(_GETPROP_RE.findall(out))
+        self._props_cache = (time.monotonic(), self.device_id, props)
+        return props
+
 # ==========================================
 # 2. 核心模块: 权限解锁专家
 # ==========================================
@@ -115,6 +216,37 @@ class PrivilegeUnlocker:
 # ==========================================
 # 3. [重写] 核心模块: 实时日志引擎 (LiveLogcatPro)
 # ==========================================
+# 日志级别 -> 控制台样式
+_LEVEL_STYLES = {
+    'V': 'dim white',
+    'D': 'blue',
+    'I': 'green',
+    'W': 'yellow',
+    'E': 'bold red',
+    'F': 'bold white on red',
+    'A': 'bold white on red',
+}
+_CRASH_STYLE = 'bold white on red'
+# 控制台输出攒批: 满 64 行或最早一行等待超过 50ms 时统一输出
+_PRINT_BATCH_LINES = 64
+_PRINT_BATCH_DELAY = 0.05
+# 录制: 管道每次最多读 64 KB; 输出文件 1 MB 缓冲, 平均每写满 1 MB 才有一次 write 系统调用
+_RECORD_READ_SIZE = 64 * 1024
+_RECORD_WRITE_BUFFER = 1024 * 1024
+# threadtime 格式: "MM-DD HH:MM:SS.mmm  PID  TID L TAG: msg", PID/TID 超宽时级别列会后移
+_THREADTIME_LEVEL_RE = re.compile(r'^\S+\s+\S+\s+\d+\s+\d+\s+([VDIWEFA])\s')
+
+def _logcat_line_style(line: str) -> str:
+    """按 threadtime 固定列取日志级别, 列位置不符时再用正则解析"""
+    level = line[31:32]
+    if level not in _LEVEL_STYLES or line[30:31] != ' ':
+        m = _THREADTIME_LEVEL_RE.match(line)
+        if not m: return 'white'
+        level = m.group(1)
+    # Java 崩溃堆栈 (AndroidRuntime 的 E 级日志) 整行高亮
+    if level == 'E' and 'AndroidRuntime' in line: return _CRASH_STYLE
+    return _LEVEL_STYLES[level]
+
 class LiveLogcatPro:
     """专业版实时日志引擎: 支持监控、分卷录制、实时统计"""
     def __init__(self, driver: AdbDriver, console: Console):
@@ -122,6 +254,7 @@ class LiveLogcatPro:
         self.console = console
         self.is_recording = False
         self.log_thread = None
+        self._record_process = None  # 后台录制用的 adb logcat 进程
         self.save_dir = os.path.join(os.getcwd(), "captured_logs")
         if not os.path.exists(self.save_dir): os.makedirs(self.save_dir)
 
@@ -129,6 +262,7 @@ class LiveLogcatPro:
         self.start_time = None
         self.current_file_path = "N/A"
         self.total_size_bytes = 0
+        self._bytes_in_file = 0  # 当前分卷已写入的字节数, 由录制线程维护
         self.max_file_size_mb = 50
         self.rotation_index = 0
 
@@ -158,6 +292,9 @@ class LiveLogcatPro:
             return
 
         self.is_recording = False
+        # 结束 logcat 进程, 录制线程阻塞中的 read 随即返回 EOF, 无需等下一条日志
+        if self._record_process and self._record_process.poll() is None:
+            self._record_process.terminate()
         if self.log_thread:
             self.log_thread.join(timeout=2)
 
@@ -184,10 +321,8 @@ class LiveLogcatPro:
                 while self.is_recording:
                     duration = datetime.now() - self.start_time
 
-                    # 获取当前文件大小
-                    current_size = 0
-                    if os.path.exists(self.current_file_path):
-                        current_size = os.path.getsize(self.current_file_path)
+                    # 当前分卷大小直接取录制线程维护的计数, 不再 stat 正在写入的文件
+                    current_size = self._bytes_in_file
 
                     # 格式化大小
                     size_mb = current_size / (1024 * 1024)
@@ -222,38 +357,58 @@ class LiveLogcatPro:
         if not self.is_recording:
             self.driver.run("logcat -c")
 
-        cmd = f"adb -s {self.driver.device_id} logcat -v threadtime"
-
         try:
-            process = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, errors='ignore')
-
+            process = subprocess.Popen(self._logcat_argv(), stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=0)
+
+            # 读取线程按块读原始字节并切分成行, 每块作为一个列表入队, 读到 EOF 时放入 None
+            lines = queue.Queue()
+            def _reader():
+                fd = process.stdout.fileno()
+                tail = b""
+                while True:
+                    chunk = os.read(fd, 65536)
+                    if not chunk: break
+                    *complete, tail = (tail + chunk).split(b"\n")
+                    if complete:
+                        lines.put([l.decode("utf-8", "ignore").strip() for l in complete])
+                if tail: lines.put([tail.decode("utf-8", "ignore").strip()])
+                lines.put(None)
+            threading.Thread(target=_reader, daemon=True).start()
+
+            batch = []
+            deadline = 0.0
             while True:
-                line = process.stdout.readline()
-                if not line: break
-
-                # 简单解析日志级别进行着色
-                line = line.strip()
-                style = "white"
-                if " E " in line or "FATAL" in line: style = "bold red"
-                elif " W " in line: style = "yellow"
-                elif " D " in line: style = "blue"
-                elif " I " in line: style = "green"
-                elif " V " in line: style = "dim white"
-
-                # 如果有 Crash，加背景高亮
-                if "FATAL EXCEPTION" in line or " AndroidRuntime:" in line and " E " in line:
-                    self.console.print(line, style="bold white on red")
-                else:
-                    # 修改后（修复）：
-                        if "FATAL" in line:
-                            self.console.print(line, style="bold white on red", markup=False) # <--- 加了这个
-                        else:
-                            self.console.print(line, style=style, markup=False) # <--- 加了这个
+                try:
+                    block = lines.get(timeout=_PRINT_BATCH_DELAY)
+                except queue.Empty:
+                    block = []  # 日志流暂时空闲, 把已攒的行输出
+                if block is None: break
+
+                flush = not block
+                for line in block:
+                    # 按日志级别着色, Crash 行加背景高亮并立即输出
+                    style = _logcat_line_style(line)
+                    if not batch: deadline = time.monotonic() + _PRINT_BATCH_DELAY
+                    batch.append(Text(line, style=style))
+                    if style == _CRASH_STYLE: flush = True
+                if len(batch) >= _PRINT_BATCH_LINES or time.monotonic() >= deadline:
+                    flush = True
+
+                if flush and batch:
+                    self.console.print(Text("\n").join(batch))
+                    batch = []
+            if batch: self.console.print(Text("\n").join(batch))
         except KeyboardInterrupt:
             process.terminate()
             self.console.print("\n[yellow]监控已暂停[/yellow]")
             time.sleep(1)
 
+    def _logcat_argv(self) -> List[str]:
+        """直接启动 adb (不经过本机 shell) 的 logcat 参数"""
+        argv = ["adb"]
+        if self.driver.device_id: argv += ["-s", self.driver.device_id]
+        return argv + ["logcat", "-v", "threadtime"]
+
     def _get_new_filepath(self, timestamp_base):
         self.rotation_index += 1
         return os.path.join(self.save_dir, f"logcat_{self.driver.device_id}_{timestamp_base}_part{self.rotation_index}.txt")
@@ -262,43 +417,76 @@ class LiveLogcatPro:
         timestamp_base = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.current_file_path = self._get_new_filepath(timestamp_base)
 
-        cmd = f"adb -s {self.driver.device_id} logcat -v threadtime"
+        max_bytes = self.max_file_size_mb * 1024 * 1024
 
         try:
-            process = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, errors='ignore')
-
-            with open(self.current_file_path, "w", encoding="utf-8") as f:
+            # 二进制无缓冲管道: 每次 os.read 直接拿到当前可读的整块数据, 不再逐行读取和解码
+            process = subprocess.Popen(self._logcat_argv(), stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=0)
+            self._record_process = process
+            fd = process.stdout.fileno()
+
+            f = open(self.current_file_path, "wb", buffering=_RECORD_WRITE_BUFFER)
+            self._bytes_in_file = 0
+            try:
                 while self.is_recording:
-                    line = process.stdout.readline()
-                    if not line: break
-                    f.write(line)
-
-                    # 简单的分卷检查 (每写入一定量后检查文件大小)
-                    # 避免频繁 IO 操作，这里简化处理
-                    if f.tell() > self.max_file_size_mb * 1024 * 1024:
+                    chunk = os.read(fd, _RECORD_READ_SIZE)
+                    if not chunk: break
+
+                    # 分卷检查: 按已写入字节数判断, 不再每行调用 f.tell()
+                    if self._bytes_in_file + len(chunk) > max_bytes:
+                        # 在最后一个换行处切开, 保证每个分卷都以完整的行结尾
+                        cut = chunk.rfind(b"\n") + 1
+                        if cut:
+                            f.write(chunk[:cut])
+                            chunk = chunk[cut:]
                         f.close()
                         self.current_file_path = self._get_new_filepath(timestamp_base)
-                        f = open(self.current_file_path, "w", encoding="utf-8")
+                        f = open(self.current_file_path, "wb", buffering=_RECORD_WRITE_BUFFER)
+                        self._bytes_in_file = 0
+
+                    f.write(chunk)
+                    self._bytes_in_file += len(chunk)
+                    self.total_size_bytes += len(chunk)
+            finally:
+                f.close()
 
             process.terminate()
         except Exception as e:
             print(f"Recorder Error: {e}")
 
+_ROOT_CHECK_TTL = 30  # Root 检查结果缓存秒数
+
 class OfflineLogManager:
     """离线日志管家"""
     def __init__(self, driver: AdbDriver, console: Console):
         self.driver = driver
         self.console = console
+        self._root_cache: Optional[Tuple[float, Optional[str], bool]] = None  # (检查时间, 设备, 是否 root)
         self.local_export_dir = os.path.join(os.getcwd(), "exported_logs")
         if not os.path.exists(self.local_export_dir): os.makedirs(self.local_export_dir)
 
     def _check_root(self) -> bool:
-        s, uid = self.driver.run("shell id")
-        if "uid=0" not in uid:
+        cache = self._root_cache
+        if (cache and cache[1] == self.driver.device_id
+                and time.monotonic() - cache[0] < _ROOT_CHECK_TTL):
+            is_root = cache[2]
+        else:
+            s, uid = self.driver.run("shell id")
+            is_root = "uid=0" in uid
+            self.note_root_status(is_root)
+        if not is_root:
             self.console.print("[bold red]❌ 此操作必须拥有 Root 权限！[/bold red]")
             return False
         return True
 
+    def note_root_status(self, is_root: bool):
+        """记录当前设备的 root 状态, 主菜单每次刷新已执行 shell id, 直接复用其结果"""
+        self._root_cache = (time.monotonic(), self.driver.device_id, is_root)
+
+    def invalidate_root_cache(self):
+        """提权或重启后权限可能变化, 下次操作重新检查"""
+        self._root_cache = None
+
     def clean_logs(self):
         if not self._check_root(): return
         self.console.clear()
@@ -340,14 +528,34 @@ class OfflineLogManager:
 
         with Progress(SpinnerColumn(), TextColumn("[bold blue]{task.description}"), BarColumn(), console=self.console) as progress:
             main_task = progress.add_task("导出中...", total=len(targets))
+            # 一次 shell 检查全部路径是否存在, 再并发拉取, 总耗时取决于最慢的一项
+            paths = " ".join(remote for remote, _ in targets)
+            s, out = self.driver.shell_eval(f'for p in {paths}; do [ -e "$p" ] && echo "OK:$p" || echo "NO:$p"; done')
+            if s:
+                existing = {line[3:] for line in out.splitlines() if line.startswith("OK:")}
+            else:
+                existing = {remote for remote, _ in targets} # 检查失败时全部交给 pull 自行报错
+            pending = []
             for remote, local_name in targets:
-                progress.update(main_task, description=f"拉取 {local_name}...")
-                s, ls = self.driver.run(f"shell ls {remote}")
-                if "No such" in ls:
+                if remote not in existing:
                     self.console.print(f"[yellow]⚠ 跳过不存在路径: {remote}[/yellow]")
+                    progress.advance(main_task)
                 else:
-                    self.driver.run(f"pull {remote} \"{os.path.join(dest_dir, local_name)}\"", timeout=300)
-                progress.advance(main_task)
+                    pending.append((remote, local_name))
+
+            progress.update(main_task, description=f"并行拉取 {len(pending)} 项...")
+            with ThreadPoolExecutor(max_workers=3) as pool:
+                futures = {
+                    pool.submit(self.driver.run, f"pull {remote} \"{os.path.join(dest_dir, local_name)}\"", timeout=300): local_name
+                    for remote, local_name in pending
+                }
+                for future in as_completed(futures):
+                    s, out = future.result()
+                    if not s:
+                        reason = escape(out.splitlines()[-1]) if out else ""
+                        self.console.print(f"[red]✘ {futures[future]} 拉取失败: {reason}[/red]")
+                    progress.update(main_task, description=f"已完成 {futures[future]}")
+                    progress.advance(main_task)
 
         self.console.print(f"[bold green]✔ 导出完成[/bold green]")
         if platform.system() == "Windows": os.startfile(dest_dir)
@@ -404,17 +612,17 @@ class DeviceDashboard:
         self.console = console
 
     def _get_prop(self, key: str) -> str:
-        s, o = self.driver.run(f"shell getprop {key}")
-        return o.strip() if s else "N/A"
+        return self.driver.getprop_all().get(key) or "N/A"
 
     def _get_shell(self, cmd: str) -> str:
-        s, o = self.driver.run(f"shell {cmd}")
+        s, o = self.driver.shell_eval(cmd)
         return o.strip() if s else "Unknown"
 
     def show(self):
         self.console.clear()
 
         with self.console.status("[bold green]正在深度读取工程信息..."):
+            self.driver.getprop_all(refresh=True)
             # --- 1. 身份识别 ---
             model = self._get_prop("ro.product.model")
             brand = self._get_prop("ro.product.brand")
@@ -657,14 +865,14 @@ class CarHouseKeepApp:
 
             # 首次运行或设备变更时获取型号信息 (缓存机制)
             if not cached_model:
-                s_m, m = self.driver.run("shell getprop ro.product.model")
-                cached_model = m.strip() if s_m else "Unknown"
-                s_v, v = self.driver.run("shell getprop ro.build.version.release")
-                cached_android = v.strip() if s_v else "Unknown"
+                props = self.driver.getprop_all(refresh=True)
+                cached_model = props.get("ro.product.model") or "Unknown"
+                cached_android = props.get("ro.build.version.release") or "Unknown"
 
             # 权限状态
             s, uid_out = self.driver.run("shell id")
             is_root = "uid=0" in uid_out
+            self.log_center.offline_mgr.note_root_status(is_root)
             perm_text = "[bold green]ROOT (Unlocked)[/bold green]" if is_root else "[bold yellow]USER (Locked)[/bold yellow]"
 
             # 日志状态
@@ -731,7 +939,9 @@ class CarHouseKeepApp:
             # --- 4. 交互逻辑 ---
             choice = Prompt.ask("\n[bold cyan]请输入指令[/bold cyan]", default="").lower()
 
-            if choice == "1": self.unlocker.execute_unlock_sequence()
+            if choice == "1":
+                self.unlocker.execute_unlock_sequence()
+                self.log_center.offline_mgr.invalidate_root_cache()
             elif choice == "2": self.sentinel.start_monitor()
             elif choice == "3": self.log_center.run_menu()
             elif choice == "4": self.action_install()
@@ -740,6 +950,7 @@ class CarHouseKeepApp:
             elif choice == "7":
                 if Prompt.ask("确认重启?", choices=["y", "n"]) == "y":
                     self.driver.run("reboot")
+                    self.log_center.offline_mgr.invalidate_root_cache()
                     cached_model = None # 重启后清除缓存
             elif choice == "q":
                 self.console.print("[green]再见！[/green]")
@@ -750,4 +961,6 @@ if __name__ == "__main__":
     try:
         app.main_menu()
     except KeyboardInterrupt:
-        print("\nExit")
\ No newline at end of file
+        print("\nExit")
+    finally:
+        app.driver.close_shell()
\ No newline at end of file